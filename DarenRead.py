@@ -0,0 +1,27 @@
+# DarenRead.py
+import logging
+from config import Config
+from crawler_core import BaseCrawler
+from extractors import FansExtractor, TgiExtractor
+# 配置日志
+logging.basicConfig(
+    level=Config.LOG_CONFIG['level'],
+    format=Config.LOG_CONFIG['format']
+)
+
+
+class DarenDataProcessor(BaseCrawler):
+    """一次打开达人详情页，同时采集粉丝数据和TGI均值"""
+
+    def __init__(self, user_data_dir=None, debugger_port=None):
+        """
+        Args:
+            user_data_dir: Chrome用户数据目录，默认使用Config.CHROME_USER_DATA_DIR
+            debugger_port: 常驻浏览器的调试端口，默认按Config.BROWSER_MODE决定
+        """
+        super().__init__([FansExtractor(), TgiExtractor()], user_data_dir=user_data_dir, debugger_port=debugger_port)
+
+
+if __name__ == "__main__":
+    processor = DarenDataProcessor()
+    processor.run()
@@ -0,0 +1,108 @@
+# api_client.py
+import logging
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config import Config
+
+
+def search_results(data):
+    """从搜索接口的data中按API_SEARCH_RESULT_PATH取出搜索结果列表，路径不存在时返回None"""
+    results = data
+    for key in Config.API_SEARCH_RESULT_PATH:
+        results = results.get(key) if isinstance(results, dict) else None
+    return results
+
+
+class ApiError(Exception):
+    """直连接口请求失败或返回数据不可用"""
+
+    def __init__(self, message, status=None, not_found=False):
+        super().__init__(message)
+        self.status = status  # HTTP状态码（如有）
+        self.not_found = not_found  # 是否为搜索无结果
+
+
+class DarenApiClient:
+    """复用浏览器登录态，通过连接池直接请求达人数据接口"""
+
+    def __init__(self, pool_size=None, timeout=None):
+        self.timeout = timeout or Config.API_TIMEOUT
+        pool_size = pool_size or Config.API_POOL_SIZE
+
+        self.session = requests.Session()
+        retry = Retry(
+            total=Config.API_MAX_RETRIES,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset(['GET', 'POST'])
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'Accept': 'application/json, text/plain, */*',
+            'Referer': Config.BASE_URL,
+            'Origin': 'https://trendinsight.oceanengine.com'
+        })
+
+    @classmethod
+    def from_driver(cls, driver, **kwargs):
+        """从已登录的浏览器会话创建客户端"""
+        client = cls(**kwargs)
+        client.load_browser_session(driver)
+        return client
+
+    def load_browser_session(self, driver):
+        """复制浏览器的Cookie和User-Agent"""
+        cookies = driver.get_cookies()
+        for cookie in cookies:
+            self.session.cookies.set(
+                cookie['name'], cookie['value'],
+                domain=cookie.get('domain'), path=cookie.get('path', '/'))
+
+        user_agent = driver.execute_script("return navigator.userAgent")
+        if user_agent:
+            self.session.headers['User-Agent'] = user_agent
+        logging.info(f"已从浏览器会话复制 {len(cookies)} 个Cookie")
+
+    def _request(self, url, payload):
+        """按配置的请求方式发送请求，返回响应中的data字段"""
+        try:
+            if Config.API_METHOD == 'GET':
+                response = self.session.get(url, params=payload, timeout=self.timeout)
+            else:
+                response = self.session.post(url, json=payload, timeout=self.timeout)
+            response.raise_for_status()
+            response_data = response.json()
+        except (requests.RequestException, ValueError) as e:
+            status = getattr(getattr(e, 'response', None), 'status_code', None)
+            raise ApiError(f"请求接口 {url} 失败: {str(e)}", status=status) from e
+
+        data = response_data.get('data') if isinstance(response_data, dict) else None
+        if not data:
+            raise ApiError(f"接口 {url} 未返回数据: {str(response_data)[:200]}")
+        return data
+
+    def resolve_user_id(self, nickname):
+        """通过搜索接口把昵称解析为达人ID，取第一个搜索结果"""
+        data = self._request(Config.DAREN_SEARCH_API_URL, {'keyword': nickname})
+        results = search_results(data)
+        if not results:
+            raise ApiError(f"昵称 {nickname} 没有搜索结果", not_found=True)
+
+        user_id = results[0].get(Config.API_USER_ID_FIELD)
+        if not user_id:
+            raise ApiError(f"搜索结果中缺少字段 {Config.API_USER_ID_FIELD}")
+        return user_id
+
+    def fetch(self, url, user_id, params=None):
+        """请求指定达人的数据接口，params为额外的请求参数（如日期范围）"""
+        payload = {Config.API_USER_ID_PARAM: user_id}
+        payload.update(params or {})
+        return self._request(url, payload)
+
+    def close(self):
+        """关闭连接池"""
+        self.session.close()
@@ -0,0 +1,110 @@
+# async_runner.py
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from rate_limiter import AdaptiveRateLimiter
+from metrics import metrics
+from worker_pool import collecting_results, spawn_worker
+
+
+class AsyncPipeline:
+    """基于asyncio的采集流水线：令牌桶限速、有界并发、按结果自适应调整速率"""
+
+    def __init__(self, primary, concurrency=None):
+        """
+        Args:
+            primary: 已初始化的采集器
+            concurrency: 最大并发数，默认使用Config.ASYNC_CONCURRENCY
+        """
+        self.primary = primary
+        self.concurrency = concurrency or Config.ASYNC_CONCURRENCY
+        self.limiter = None
+        self.browsers = None
+
+    async def _create_browsers(self, loop, executor):
+        """准备浏览器队列：主采集器加上WORKER_COUNT-1个独立配置的浏览器"""
+        self.browsers = asyncio.Queue()
+        self.browsers.put_nowait(self.primary)
+
+        extra = [
+            loop.run_in_executor(
+                executor, lambda i=i: spawn_worker(self.primary, i))
+            for i in range(1, Config.WORKER_COUNT)
+        ]
+        processors = []
+        for result in await asyncio.gather(*extra, return_exceptions=True):
+            if isinstance(result, Exception):
+                logging.error(f"创建额外浏览器失败: {str(result)}")
+                continue
+            processors.append(result)
+            self.browsers.put_nowait(result)
+        return processors
+
+    async def _process(self, loop, executor, semaphore, nickname):
+        """处理单个昵称：走直连接口或占用一个浏览器，每次发出请求前才取令牌"""
+        async with semaphore:
+            # 登录失效时等待重新登录
+            if not await loop.run_in_executor(executor, self.primary.login_gate.wait):
+                return False
+            start = loop.time()
+
+            results = self.primary._empty_results()
+            # 客户端创建失败时全部走浏览器流程，避免并发任务在执行线程中操作主浏览器
+            if Config.FETCH_MODE == 'api' and self.primary.api_client is not None:
+                await self.limiter.acquire()
+                results = await loop.run_in_executor(executor, self.primary._fetch_via_api, nickname)
+
+            if self.primary._needs_browser(nickname, results):
+                processor = await self.browsers.get()
+                try:
+                    # 拿到浏览器后再取令牌，等待浏览器的任务不会提前消耗令牌
+                    await self.limiter.acquire()
+                    browser_results = await loop.run_in_executor(
+                        executor, processor._search_in_browser, nickname)
+                finally:
+                    self.browsers.put_nowait(processor)
+                results = self.primary._merge_results(results, browser_results)
+
+            success = self.primary._record_results(nickname, results)
+            metrics.record('creator_total', loop.time() - start)
+            self.limiter.record(success)
+            return success
+
+    async def _run(self, chunks):
+        """按块并发处理昵称，浏览器和限速器在各块之间复用"""
+        loop = asyncio.get_running_loop()
+        self.limiter = AdaptiveRateLimiter()
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency + Config.WORKER_COUNT) as executor:
+            extra_processors = await self._create_browsers(loop, executor)
+
+            if Config.FETCH_MODE == 'api':
+                # 预先创建客户端，避免并发任务同时操作浏览器复制登录态
+                try:
+                    await loop.run_in_executor(executor, self.primary._get_api_client)
+                except Exception as e:
+                    logging.warning(f"创建直连接口客户端失败: {str(e)}")
+
+            results = []
+            try:
+                with collecting_results(self.primary.extractors):
+                    for chunk in chunks:
+                        results += await asyncio.gather(
+                            *(self._process(loop, executor, semaphore, nickname) for nickname in chunk))
+            finally:
+                for processor in extra_processors:
+                    await loop.run_in_executor(executor, processor.close)
+
+        succeeded = sum(1 for result in results if result)
+        logging.info(f"异步流水线处理完成，成功 {succeeded}/{len(results)} 个，"
+                     f"最终速率 {self.limiter.rate:.2f}/秒")
+
+    def run(self, chunks):
+        """
+        运行流水线直至所有昵称处理完成
+        Args:
+            chunks: 昵称列表的可迭代对象，每个元素为一块昵称
+        """
+        asyncio.run(self._run(chunks))
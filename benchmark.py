@@ -0,0 +1,233 @@
+# benchmark.py
+import os
+import ast
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+import threading
+import subprocess
+import pandas as pd
+from config import Config
+from mock_site import MockTrendSite
+from browser_lifecycle import process_tree_rss_mb
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+PROCESSORS = {
+    'tgi': ('TgiRead', 'TGIDataProcessor'),
+    'fans': ('FansRead', 'FansDataProcessor'),
+    'daren': ('DarenRead', 'DarenDataProcessor'),
+}
+
+
+def parse_overrides(items):
+    """把 KEY=VALUE 形式的参数解析为Config覆盖项，VALUE按Python字面量解析，失败时作为字符串"""
+    overrides = {}
+    for item in items or []:
+        key, _, value = item.partition('=')
+        try:
+            overrides[key] = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            overrides[key] = value
+    return overrides
+
+
+def write_nickname_files(size):
+    """在当前目录生成包含size个合成昵称的TgiData.xlsx和FansData.xlsx"""
+    nicknames = [f"达人{i:05d}" for i in range(1, size + 1)]
+    ranks = list(range(1, size + 1))
+    pd.DataFrame({'排名': ranks, Config.NICKNAME_COLUMN: nicknames, Config.TGI_COLUMN: None}).to_excel(
+        Config.TGI_EXCEL_FILE, sheet_name=Config.SHEET_NAME, index=False)
+    pd.DataFrame({'排名': ranks, Config.NICKNAME_COLUMN: nicknames}).to_excel(
+        Config.FANS_EXCEL_FILE, sheet_name=Config.SHEET_NAME, index=False)
+
+
+class TreeMemorySampler:
+    """后台定期统计本进程及其子进程（ChromeDriver、Chrome各进程）的内存之和，记录峰值"""
+
+    def __init__(self, interval=0.5):
+        self.interval = interval
+        self.peak = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+
+    def _sample(self):
+        try:
+            memory, _ = process_tree_rss_mb(os.getpid())
+        except Exception as e:
+            # 没有psutil且不是Linux时无法统计
+            logging.debug(f"无法统计进程树内存: {str(e)}")
+            self._stop.set()
+            return
+        self.peak = memory if self.peak is None else max(self.peak, memory)
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """停止采样（关闭浏览器之前调用），返回峰值(MB)"""
+        if not self._stop.is_set():
+            self._sample()
+        self._stop.set()
+        self._thread.join()
+        return self.peak
+
+
+def peak_memory_mb():
+    """Python进程的内存峰值(MB)；没有resource模块时返回tracemalloc统计的Python内存峰值"""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux单位为KB，macOS为字节
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    import tracemalloc
+    return tracemalloc.get_traced_memory()[1] / (1024 * 1024) if tracemalloc.is_tracing() else None
+
+
+def run_case(processor_name, size, overrides, workdir):
+    """在子进程中执行一个用例：生成数据、运行采集器，返回吞吐量和内存统计"""
+    if resource is None:
+        import tracemalloc
+        tracemalloc.start()
+
+    os.makedirs(workdir, exist_ok=True)
+    # 数据文件、断点库、缓存库都使用相对路径，切换目录即可与正式数据隔离
+    Config.DRIVER_CACHE_FILE = os.path.abspath(Config.DRIVER_CACHE_FILE)
+    os.chdir(workdir)
+    Config.CHROME_USER_DATA_DIR = os.path.join(workdir, 'chrome_profile')
+    Config.RESUME = False
+    for key, value in overrides.items():
+        setattr(Config, key, value)
+
+    write_nickname_files(size)
+
+    # 提取器在导入时读取Config中的接口地址，必须在覆盖配置之后导入
+    module_name, class_name = PROCESSORS[processor_name]
+    processor_class = getattr(__import__(module_name), class_name)
+    from metrics import metrics
+
+    sampler = TreeMemorySampler().start()
+    processor = processor_class()
+    try:
+        start = time.perf_counter()
+        processor.run()
+        elapsed = time.perf_counter() - start
+    finally:
+        tree_peak = sampler.stop()
+        processor.close()
+
+    summary = metrics.summary()
+    return {
+        'processor': processor_name,
+        'size': size,
+        'elapsed': elapsed,
+        'creators': summary['creators'],
+        'succeeded': summary['succeeded'],
+        'creators_per_sec': summary['creators'] / elapsed if elapsed > 0 else 0.0,
+        # 包含Chrome各进程的内存峰值，无法统计进程树时为None
+        'peak_memory_mb': tree_peak,
+        'peak_python_mb': peak_memory_mb(),
+        'stages': summary['stages'],
+    }
+
+
+def spawn_case(processor_name, size, overrides, workdir):
+    """用独立子进程运行用例，保证内存峰值和模块状态互不影响"""
+    command = [
+        sys.executable, os.path.abspath(__file__), '--case',
+        '--processors', processor_name, '--sizes', str(size), '--workdir', workdir,
+        '--config-json', json.dumps(overrides, ensure_ascii=False),
+    ]
+    completed = subprocess.run(command, stdout=subprocess.PIPE, text=True, encoding='utf-8')
+    lines = completed.stdout.strip().splitlines()
+    if completed.returncode != 0 or not lines:
+        raise RuntimeError(f"用例 {processor_name}/{size} 运行失败，退出码 {completed.returncode}")
+    return json.loads(lines[-1])
+
+
+def report(results):
+    """输出各用例的吞吐量和内存峰值（含浏览器的进程树峰值和Python进程峰值）"""
+    def mb(value):
+        return '-' if value is None else round(value, 1)
+
+    logging.info(f"\n{'采集器':<8}{'规模':>8}{'成功':>8}{'耗时(秒)':>12}{'达人/秒':>10}"
+                 f"{'内存峰值(MB)':>14}{'Python峰值(MB)':>16}")
+    for result in results:
+        logging.info(
+            f"{result['processor']:<8}{result['size']:>8}{result['succeeded']:>8}"
+            f"{result['elapsed']:>12.1f}{result['creators_per_sec']:>10.2f}"
+            f"{mb(result['peak_memory_mb']):>14}{mb(result.get('peak_python_mb')):>16}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="基于本地模拟站点的离线性能测试")
+    parser.add_argument('--processors', nargs='+', default=['tgi', 'fans'], choices=sorted(PROCESSORS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=[100], help="合成昵称数量，如 100 1000 10000")
+    parser.add_argument('--latency', type=float, default=0.2, help="接口平均延迟(秒)")
+    parser.add_argument('--page-latency', type=float, default=0.3, help="搜索结果渲染平均延迟(秒)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="数据接口返回500的概率")
+    parser.add_argument('--not-found-rate', type=float, default=0.0, help="没有搜索结果的昵称比例")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--set', dest='overrides', action='append', metavar='KEY=VALUE',
+                        help="覆盖Config配置，如 --set RUN_MODE=async --set BATCH_INTERVAL=0")
+    parser.add_argument('--workdir', help="用例工作目录，默认使用临时目录并在结束后删除")
+    parser.add_argument('--output', help="把结果写入JSON文件")
+    parser.add_argument('--case', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--config-json', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=Config.LOG_CONFIG['level'],
+        format=Config.LOG_CONFIG['format']
+    )
+
+    if args.case:
+        result = run_case(args.processors[0], args.sizes[0], json.loads(args.config_json), args.workdir)
+        print(json.dumps(result, ensure_ascii=False))
+        return
+
+    site = MockTrendSite(
+        latency=args.latency, page_latency=args.page_latency, error_rate=args.error_rate,
+        not_found_rate=args.not_found_rate, seed=args.seed).start()
+    overrides = site.config_overrides()
+    overrides.update(parse_overrides(args.overrides))
+
+    workdir = os.path.abspath(args.workdir) if args.workdir else tempfile.mkdtemp(prefix='daren_bench_')
+    results = []
+    try:
+        for processor_name in args.processors:
+            for size in args.sizes:
+                logging.info(f"开始用例: {processor_name} × {size}")
+                case_dir = os.path.join(workdir, f"{processor_name}_{size}")
+                shutil.rmtree(case_dir, ignore_errors=True)
+                try:
+                    results.append(spawn_case(processor_name, size, overrides, case_dir))
+                except Exception as e:
+                    logging.error(str(e))
+    finally:
+        site.stop()
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report(results)
+    logging.info(f"模拟站点请求统计: {site.stats}")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'site': site.stats, 'results': results}, f, ensure_ascii=False, indent=2)
+        logging.info(f"性能测试结果已写入 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+# browser_lifecycle.py
+import os
+import itertools
+import logging
+from config import Config
+from metrics import metrics
+
+try:
+    import psutil
+except ImportError:  # 可选依赖，Linux下没有psutil时读取/proc
+    psutil = None
+
+
+_labels = itertools.count()
+
+
+def _process_rss(pid):
+    """进程常驻内存(字节)"""
+    if psutil is not None:
+        return psutil.Process(pid).memory_info().rss
+    with open(f"/proc/{pid}/statm", encoding='ascii') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+def _children_map():
+    """读取/proc得到 父进程 -> 子进程列表 的映射"""
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", encoding='ascii', errors='replace') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # 进程名可能包含空格和括号，父进程号是最后一个')'之后的第二个字段
+        ppid = int(stat.rsplit(')', 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry))
+    return children
+
+
+def process_tree(pid):
+    """pid及其所有子孙进程"""
+    if psutil is not None:
+        try:
+            return [pid] + [child.pid for child in psutil.Process(pid).children(recursive=True)]
+        except psutil.Error:
+            return []
+    children = _children_map()
+    pids, stack = [], [pid]
+    while stack:
+        current = stack.pop()
+        pids.append(current)
+        stack.extend(children.get(current, []))
+    return pids
+
+
+def process_tree_rss_mb(pid, include_root=True):
+    """
+    进程树的常驻内存之和(MB)
+    Args:
+        pid: 根进程
+        include_root: 是否包含根进程本身
+    Returns:
+        (内存MB, 统计到的进程数)
+    """
+    pids = process_tree(pid)
+    if not include_root:
+        pids = pids[1:]
+    total = counted = 0
+    for current in pids:
+        try:
+            total += _process_rss(current)
+            counted += 1
+        except Exception:
+            # 进程可能已经退出
+            continue
+    return total / (1024 * 1024), counted
+
+
+class BrowserLifecycle:
+    """跟踪单个浏览器的导航次数和内存占用，超过阈值时提示采集器重启浏览器"""
+
+    def __init__(self, max_navigations=None, max_memory_mb=None, max_heap_mb=None, check_every=None):
+        """
+        Args:
+            max_navigations: 导航多少次后重启，默认使用Config.BROWSER_MAX_NAVIGATIONS
+            max_memory_mb: 进程内存超过多少MB时重启，默认使用Config.BROWSER_MAX_MEMORY_MB
+            max_heap_mb: 无法统计进程内存时，JS堆超过多少MB时重启，默认使用Config.BROWSER_MAX_JS_HEAP_MB
+            check_every: 每处理多少个达人检查一次内存，默认使用Config.BROWSER_MEMORY_CHECK_EVERY
+        """
+        self.max_navigations = max_navigations or Config.BROWSER_MAX_NAVIGATIONS
+        self.max_memory_mb = max_memory_mb or Config.BROWSER_MAX_MEMORY_MB
+        self.max_heap_mb = max_heap_mb or Config.BROWSER_MAX_JS_HEAP_MB
+        self.check_every = check_every or Config.BROWSER_MEMORY_CHECK_EVERY
+        self.label = next(_labels)
+        self.navigations = 0
+        self.restarts = 0
+        self._creators = 0
+        self._use_rss = True
+        self._performance_enabled = False
+
+    def record_navigation(self):
+        """记录一次页面导航"""
+        self.navigations += 1
+
+    @staticmethod
+    def _rss_mb(driver):
+        """
+        ChromeDriver启动的浏览器进程树（主进程、渲染进程、GPU进程等）的常驻内存之和(MB)。
+        连接常驻浏览器时浏览器不是ChromeDriver的子进程，返回None
+        """
+        process = getattr(getattr(driver, 'service', None), 'process', None)
+        if process is None:
+            return None
+        memory, counted = process_tree_rss_mb(process.pid, include_root=False)
+        return memory if counted else None
+
+    def _heap_mb(self, driver):
+        """当前页面的JS堆大小(MB)，无法读取进程内存时使用"""
+        if not self._performance_enabled:
+            driver.execute_cdp_cmd('Performance.enable', {})
+            self._performance_enabled = True
+        values = driver.execute_cdp_cmd('Performance.getMetrics', {})['metrics']
+        for item in values:
+            if item['name'] == 'JSHeapTotalSize':
+                return item['value'] / (1024 * 1024)
+        return None
+
+    def memory_mb(self, driver):
+        """
+        浏览器内存占用：优先统计进程常驻内存，不可用时退回页面JS堆大小
+        Returns:
+            (内存MB, 'rss'或'js_heap')，都无法读取时内存为None
+        """
+        if self._use_rss:
+            try:
+                memory = self._rss_mb(driver)
+                if memory is not None:
+                    return memory, 'rss'
+            except Exception as e:
+                logging.debug(f"无法读取浏览器进程内存: {str(e)}")
+            logging.info("无法统计浏览器进程内存，改为按JS堆大小判断是否重启")
+            self._use_rss = False
+        try:
+            return self._heap_mb(driver), 'js_heap'
+        except Exception as e:
+            logging.debug(f"读取浏览器内存失败: {str(e)}")
+            return None, 'js_heap'
+
+    def check(self, driver):
+        """
+        每处理完一个达人调用一次，按间隔采样内存并记录到运行指标
+        Returns:
+            需要重启浏览器的原因，不需要时返回None
+        """
+        self._creators += 1
+        if self.max_navigations and self.navigations >= self.max_navigations:
+            return f"浏览器已导航 {self.navigations} 次"
+
+        if self._creators % self.check_every:
+            return None
+        memory, kind = self.memory_mb(driver)
+        if memory is None:
+            return None
+        metrics.sample(f"browser_{kind}_mb#{self.label}", memory)
+        # JS堆只是页面内存的一部分，使用单独的阈值
+        limit = self.max_memory_mb if kind == 'rss' else self.max_heap_mb
+        if limit and memory >= limit:
+            label = '进程内存' if kind == 'rss' else 'JS堆'
+            return f"浏览器{label} {memory:.0f}MB 超过 {limit}MB"
+        return None
+
+    def restarted(self):
+        """浏览器重启后重新计数；新浏览器需要重新开启Performance域"""
+        self.navigations = 0
+        self.restarts += 1
+        self._performance_enabled = False
@@ -0,0 +1,223 @@
+# browser_session.py
+import os
+import sys
+import json
+import time
+import logging
+import subprocess
+import urllib.request
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import SessionNotCreatedException
+from webdriver_manager.chrome import ChromeDriverManager
+from config import Config
+
+
+def get_driver_path(refresh=False):
+    """返回缓存的ChromeDriver路径，只在缓存不存在或失效时调用webdriver_manager联网检查"""
+    if not refresh and os.path.exists(Config.DRIVER_CACHE_FILE):
+        with open(Config.DRIVER_CACHE_FILE, encoding='utf-8') as f:
+            driver_path = f.read().strip()
+        if driver_path and os.path.exists(driver_path):
+            return driver_path
+
+    logging.info("正在通过webdriver_manager获取ChromeDriver")
+    driver_path = ChromeDriverManager().install()
+    with open(Config.DRIVER_CACHE_FILE, 'w', encoding='utf-8') as f:
+        f.write(driver_path)
+    return driver_path
+
+
+def is_browser_alive(port):
+    """检查指定调试端口上是否有可连接的浏览器"""
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/json/version", timeout=0.5):
+            return True
+    except OSError:
+        return False
+
+
+def default_user_data_dir():
+    """默认的用户数据目录：精简模式使用空白目录，否则使用用户的Chrome配置"""
+    if Config.LEAN_BROWSER:
+        return os.path.abspath(Config.LEAN_PROFILE_DIR)
+    return Config.CHROME_USER_DATA_DIR
+
+
+def lean_arguments():
+    """精简模式的Chrome启动参数：无头、不加载图片、关闭后台服务"""
+    arguments = [
+        "--headless=new",
+        "--disable-gpu",
+        "--blink-settings=imagesEnabled=false",
+        "--disable-extensions",
+        "--disable-background-networking",
+        "--disable-component-update",
+        "--disable-sync",
+        "--mute-audio",
+        "--window-size=1366,900",
+    ]
+    if sys.platform.startswith('linux'):
+        # 无图形界面的Linux服务器/容器中运行所需
+        arguments += ["--no-sandbox", "--disable-dev-shm-usage"]
+    return arguments
+
+
+def launch_browser(port, user_data_dir=None):
+    """以远程调试模式启动一个独立于脚本进程的常驻浏览器"""
+    command = [
+        Config.CHROME_BINARY,
+        f"--remote-debugging-port={port}",
+        f"--user-data-dir={user_data_dir or default_user_data_dir()}",
+        "--no-first-run",
+        "--no-default-browser-check",
+    ]
+    if Config.LEAN_BROWSER:
+        command += lean_arguments()
+    else:
+        command.append(f"--profile-directory={Config.CHROME_PROFILE}")
+    kwargs = {'stdout': subprocess.DEVNULL, 'stderr': subprocess.DEVNULL}
+    if sys.platform == 'win32':
+        kwargs['creationflags'] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs['start_new_session'] = True
+    subprocess.Popen(command, **kwargs)
+
+    deadline = time.monotonic() + Config.BROWSER_LAUNCH_TIMEOUT
+    while time.monotonic() < deadline:
+        if is_browser_alive(port):
+            logging.info(f"常驻浏览器已在端口 {port} 启动")
+            return
+        time.sleep(0.2)
+    raise RuntimeError(f"启动常驻浏览器超时（端口 {port}）")
+
+
+def build_options(user_data_dir=None, debugger_port=None):
+    """构造Chrome启动参数；指定调试端口时连接常驻浏览器"""
+    chrome_options = Options()
+    chrome_options.set_capability(
+        'goog:loggingPrefs', {'performance': 'ALL'})
+
+    if debugger_port:
+        chrome_options.debugger_address = f"127.0.0.1:{debugger_port}"
+    elif Config.LEAN_BROWSER:
+        chrome_options.add_argument(f"user-data-dir={user_data_dir or default_user_data_dir()}")
+        for argument in lean_arguments():
+            chrome_options.add_argument(argument)
+    else:
+        chrome_options.add_argument(
+            f"user-data-dir={user_data_dir or Config.CHROME_USER_DATA_DIR}")
+        chrome_options.add_argument(
+            f"profile-directory={Config.CHROME_PROFILE}")
+    return chrome_options
+
+
+def export_session_cookies(driver, cookie_file=None):
+    """把浏览器中平台域名下的Cookie导出到文件，供精简模式恢复登录态"""
+    cookie_file = cookie_file or Config.SESSION_COOKIE_FILE
+    cookies = driver.execute_cdp_cmd('Network.getAllCookies', {})['cookies']
+    cookies = [
+        cookie for cookie in cookies
+        if any(cookie['domain'].lstrip('.').endswith(domain) for domain in Config.SESSION_COOKIE_DOMAINS)
+    ]
+    with open(cookie_file, 'w', encoding='utf-8') as f:
+        json.dump(cookies, f, ensure_ascii=False, indent=2)
+    logging.info(f"已导出 {len(cookies)} 个Cookie到 {cookie_file}")
+    return len(cookies)
+
+
+def load_session_cookies(driver, cookie_file=None):
+    """把导出的Cookie写入浏览器，返回写入的数量"""
+    cookie_file = cookie_file or Config.SESSION_COOKIE_FILE
+    if not os.path.exists(cookie_file):
+        logging.warning(f"找不到Cookie文件 {cookie_file}，请先执行 python browser_session.py --export-cookies")
+        return 0
+
+    with open(cookie_file, encoding='utf-8') as f:
+        cookies = json.load(f)
+    fields = ('name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'sameSite', 'expires')
+    params = [{key: cookie[key] for key in fields if key in cookie} for cookie in cookies]
+    # 会话Cookie的expires为-1，写入时不能带该字段
+    for cookie in params:
+        if cookie.get('expires', 0) < 0:
+            del cookie['expires']
+    driver.execute_cdp_cmd('Network.setCookies', {'cookies': params})
+    logging.info(f"已从 {cookie_file} 恢复 {len(params)} 个Cookie")
+    return len(params)
+
+
+def apply_lean_settings(driver):
+    """精简模式：屏蔽图片/媒体/字体和统计脚本，并从Cookie文件恢复登录态"""
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': Config.LEAN_BLOCKED_URLS})
+    load_session_cookies(driver)
+
+
+def shutdown_browser(driver, debugger_port=None):
+    """
+    关闭浏览器释放内存。常驻浏览器模式下quit只断开连接，
+    需要通过CDP关闭浏览器并等待调试端口释放，之后create_driver会重新启动它
+    """
+    if debugger_port:
+        try:
+            driver.execute_cdp_cmd('Browser.close', {})
+        except Exception:
+            pass
+    try:
+        driver.quit()
+    except Exception as e:
+        logging.warning(f"关闭浏览器时出错: {str(e)}")
+    if debugger_port:
+        deadline = time.monotonic() + Config.BROWSER_LAUNCH_TIMEOUT
+        while is_browser_alive(debugger_port) and time.monotonic() < deadline:
+            time.sleep(0.2)
+
+
+def create_driver(user_data_dir=None, debugger_port=None):
+    """
+    创建WebDriver
+    Args:
+        user_data_dir: Chrome用户数据目录，默认使用Config.CHROME_USER_DATA_DIR
+        debugger_port: 常驻浏览器的调试端口；为None时按BROWSER_MODE决定是否连接常驻浏览器
+    开启LEAN_BROWSER时以无头模式运行，屏蔽无用资源并从SESSION_COOKIE_FILE恢复登录态
+    """
+    if debugger_port is None and Config.BROWSER_MODE == 'attach':
+        debugger_port = Config.DEBUGGER_PORT
+    if debugger_port and not is_browser_alive(debugger_port):
+        launch_browser(debugger_port, user_data_dir)
+
+    chrome_options = build_options(user_data_dir, debugger_port)
+    try:
+        driver = webdriver.Chrome(service=Service(get_driver_path()), options=chrome_options)
+    except SessionNotCreatedException as e:
+        # 浏览器升级后缓存的ChromeDriver版本可能不匹配，刷新后重试一次
+        logging.warning(f"ChromeDriver与浏览器版本不匹配，重新获取: {str(e)[:200]}")
+        driver = webdriver.Chrome(service=Service(get_driver_path(refresh=True)), options=chrome_options)
+
+    if Config.LEAN_BROWSER:
+        apply_lean_settings(driver)
+    return driver
+
+
+if __name__ == "__main__":
+    # 预先启动常驻浏览器：python browser_session.py
+    logging.basicConfig(
+        level=Config.LOG_CONFIG['level'],
+        format=Config.LOG_CONFIG['format']
+    )
+    if '--export-cookies' in sys.argv:
+        # 用正常的Chrome配置（已登录）导出Cookie：python browser_session.py --export-cookies
+        Config.LEAN_BROWSER = False
+        Config.BROWSER_MODE = 'launch'
+        driver = create_driver()
+        try:
+            driver.get(Config.BASE_URL)
+            export_session_cookies(driver)
+        finally:
+            driver.quit()
+    elif is_browser_alive(Config.DEBUGGER_PORT):
+        logging.info(f"常驻浏览器已在端口 {Config.DEBUGGER_PORT} 运行")
+    else:
+        get_driver_path()
+        launch_browser(Config.DEBUGGER_PORT)
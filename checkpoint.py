@@ -0,0 +1,113 @@
+# checkpoint.py
+import time
+import uuid
+import sqlite3
+import logging
+import threading
+from config import Config
+
+
+class Checkpoint:
+    """基于SQLite的采集进度记录，支持中断后续采及按采集时间判断数据是否新鲜"""
+
+    def __init__(self, data_type, db_path=None):
+        """
+        Args:
+            data_type: 数据类型，如 'tgi'、'fans'
+            db_path: SQLite文件路径，默认使用Config.CHECKPOINT_DB
+        """
+        self.data_type = data_type
+        self.run_id = None
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path or Config.CHECKPOINT_DB, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                data_type TEXT NOT NULL,
+                total INTEGER,
+                started_at REAL,
+                finished_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS progress (
+                run_id TEXT NOT NULL,
+                data_type TEXT NOT NULL,
+                nickname TEXT NOT NULL,
+                success INTEGER NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (run_id, nickname)
+            );
+            CREATE INDEX IF NOT EXISTS idx_progress_nickname
+                ON progress (data_type, nickname, success, updated_at);
+        """)
+        self.conn.commit()
+
+    def start_run(self, total, resume=None):
+        """开始一次采集：存在未完成的同类型任务时继续该任务，否则新建"""
+        resume = Config.RESUME if resume is None else resume
+        with self._lock:
+            row = None
+            if resume:
+                row = self.conn.execute(
+                    "SELECT run_id FROM runs WHERE data_type = ? AND finished_at IS NULL "
+                    "ORDER BY started_at DESC LIMIT 1", (self.data_type,)).fetchone()
+
+            if row:
+                self.run_id = row[0]
+                logging.info(f"继续未完成的采集任务 {self.run_id}")
+            else:
+                self.run_id = uuid.uuid4().hex[:12]
+                self.conn.execute(
+                    "INSERT INTO runs (run_id, data_type, total, started_at) VALUES (?, ?, ?, ?)",
+                    (self.run_id, self.data_type, total, time.time()))
+                self.conn.commit()
+                logging.info(f"开始新的采集任务 {self.run_id}")
+            return self.run_id
+
+    def completed(self):
+        """当前任务中已成功采集的昵称集合"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT nickname FROM progress WHERE run_id = ? AND success = 1", (self.run_id,))
+            return {row[0] for row in rows}
+
+    def record(self, nickname, success):
+        """记录一个昵称的处理结果"""
+        if self.run_id is None:
+            return
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO progress (run_id, data_type, nickname, success, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self.run_id, self.data_type, nickname, int(bool(success)), time.time()))
+            self.conn.commit()
+
+    def last_success(self, nickname):
+        """该昵称最近一次成功采集的时间戳，从未成功时返回None"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT MAX(updated_at) FROM progress WHERE data_type = ? AND nickname = ? AND success = 1",
+                (self.data_type, nickname)).fetchone()
+            return row[0] if row else None
+
+    def last_success_all(self):
+        """所有昵称最近一次成功采集的时间戳 {昵称: 时间戳}"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT nickname, MAX(updated_at) FROM progress WHERE data_type = ? AND success = 1 "
+                "GROUP BY nickname", (self.data_type,))
+            return dict(rows.fetchall())
+
+    def finish_run(self):
+        """标记当前任务完成，下次运行将开始新任务"""
+        if self.run_id is None:
+            return
+        with self._lock:
+            self.conn.execute(
+                "UPDATE runs SET finished_at = ? WHERE run_id = ?", (time.time(), self.run_id))
+            self.conn.commit()
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self.conn.close()
@@ -5,6 +5,7 @@ class Config:
     BASE_URL = "https://trendinsight.oceanengine.com/arithmetic-index?type=3"
     SEARCH_BASE_URL = "https://trendinsight.oceanengine.com/arithmetic-index/daren/search?keyword="
     API_URL = "https://trendinsight.oceanengine.com/api/v2/daren/get_great_user_fans_info"
+    FANS_API_URL = "https://trendinsight.oceanengine.com/api/v2/daren/get_great_user_mile_Info"
 
     # 文件配置
     TGI_EXCEL_FILE = "TgiData.xlsx"
@@ -16,16 +17,152 @@ class Config:
     # Chrome配置
     CHROME_USER_DATA_DIR = r"C:\Users\undefined\AppData\Local\Google\Chrome\User Data"
     CHROME_PROFILE = "Default"
+    CHROME_BINARY = r"C:\Program Files\Google\Chrome\Application\chrome.exe"
+    BROWSER_MODE = "launch"          # launch: 每次运行启动新浏览器; attach: 连接常驻浏览器（不存在时自动启动），运行结束后保留
+    DEBUGGER_PORT = 9222             # 常驻浏览器的远程调试端口，多浏览器时依次加1
+    BROWSER_LAUNCH_TIMEOUT = 15      # 等待常驻浏览器启动的超时时间(秒)
+    DRIVER_CACHE_FILE = ".chromedriver_path"  # 缓存ChromeDriver路径，避免每次联网检查
+
+    # 精简浏览器配置
+    LEAN_BROWSER = False  # 无头运行，屏蔽图片/媒体/字体和第三方统计脚本，只用Cookie恢复登录态
+    LEAN_PROFILE_DIR = "lean_profile"            # 精简模式使用的空白用户数据目录
+    SESSION_COOKIE_FILE = "session_cookies.json" # 从正常浏览器导出的登录Cookie
+    SESSION_COOKIE_DOMAINS = ('oceanengine.com',)  # 导出Cookie的域名
+    LEAN_BLOCKED_URLS = [                        # 通过CDP屏蔽的请求，支持*通配符
+        '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+        '*.mp4', '*.webm', '*.mp3', '*.m3u8',
+        '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+        '*google-analytics.com*', '*googletagmanager.com*', '*hm.baidu.com*',
+        '*mcs.snssdk.com*', '*mon.zijieapi.com*', '*/slardar/*', '*/monitor_browser/*',
+    ]
 
     # 等待时间配置
-    WAIT_TIMEOUT = 20  # 显式等待超时时间
+    WAIT_TIMEOUT = 20  # 未在STEP_TIMEOUTS中配置的步骤使用的显式等待超时时间
     BATCH_SIZE = 10    # 每批处理的数量
     BATCH_INTERVAL = 1 # 批次间隔时间(秒)
+    WAIT_POLL_INTERVAL = 0.1  # 条件等待的检查间隔(秒)，条件满足后立即继续
+    STEP_TIMEOUTS = {         # 各步骤的超时预算(秒)，只在页面异常时才会等满
+        'search_results': 10,  # 等待搜索结果（或无结果提示）出现
+        'detail_button': 5,    # 等待达人详情按钮可点击
+        'tab': 5,              # 等待详情页标签可点击
+        'response': 10,        # 等待目标接口响应
+    }
+
+    # 昵称输入配置
+    INPUT_FILE = None        # 昵称列表文件（xlsx/xls/csv），按块流式读取；为None时使用结果Excel中的昵称列
+    INPUT_SHEET = None       # 输入文件的工作表，为None时使用第一个工作表
+    INPUT_CHUNK_SIZE = 500   # 每次读取、去重并分发的昵称数量
+    BATCH_INPUTS = None      # 批量模式：输入目录或通配符（可为列表），如 "lists/*.xlsx"；所有文件、工作表的昵称合并去重后只采集一次
+    BATCH_INPUT_SHEETS = None         # 批量模式读取的工作表名称列表，为None时读取每个文件的所有工作表
+    BATCH_OUTPUT_DIR = "batch_results"  # 批量模式的结果目录，每个输入文件对应一个同名xlsx，各工作表附加采集结果
+
+    # 浏览器重启配置（长时间运行时限制浏览器内存）
+    BROWSER_MAX_NAVIGATIONS = 500     # 每个浏览器导航多少次后重启（保留登录态），为None时不限制
+    BROWSER_MAX_MEMORY_MB = 1500      # 浏览器进程内存超过该值(MB)时重启，为None时不限制
+    BROWSER_MAX_JS_HEAP_MB = 300      # 无法统计进程内存（如连接常驻浏览器）时，页面JS堆超过该值(MB)时重启
+    BROWSER_MEMORY_CHECK_EVERY = 10   # 每处理多少个达人采样一次浏览器内存并记录到运行指标
+
+    # 优先级调度配置
+    SCHEDULER_ENABLED = False         # 按 陈旧度×优先级 排序采集，只采集已到刷新时间的达人
+    PRIORITY_COLUMN = "优先级"          # 结果表中的优先级列（数值越大越优先），未填写时使用DEFAULT_PRIORITY
+    REFRESH_INTERVAL_COLUMN = "刷新间隔"  # 结果表中的刷新间隔列(小时)，未填写时使用DEFAULT_REFRESH_HOURS
+    DEFAULT_PRIORITY = 1
+    DEFAULT_REFRESH_HOURS = 168       # 默认每周刷新一次
+    RUN_MAX_CREATORS = None           # 每次运行最多采集的达人数，None表示不限
+    RUN_MAX_MINUTES = None            # 每次运行的时间预算(分钟)，到时后不再分发新的达人
+    SCHEDULE_CHUNK_SIZE = 20          # 调度时每次分发的达人数，时间预算在每块之间检查
+
+    # 失败重试配置
+    RETRY_BUDGETS = {             # 各类失败在本次运行末尾最多重试的次数
+        'timeout': 3,             # 页面或接口响应超时、网络错误
+        'login_expired': 3,       # 登录失效（重新登录后重试）
+        'selector_changed': 1,    # 页面元素找不到，可能是页面改版
+        'error': 1,               # 其他错误
+        'not_found': 0,           # 没有搜索结果
+    }
+    RETRY_BACKOFF = 5             # 第一次重试前的等待时间(秒)，之后每次翻倍
+    RETRY_BACKOFF_MAX = 120       # 重试等待时间上限(秒)
+    LOGIN_URL_MARKERS = ('login', 'passport')          # 页面跳转到的URL域名或路径包含这些内容时视为登录失效
+    LOGIN_EXPIRED_MESSAGES = ('未登录', '登录失效', '请登录')  # 接口响应中出现这些内容时视为登录失效
+    LOGIN_CHECK_INTERVAL = 30     # 登录失效后检查是否已重新登录的间隔(秒)
+    LOGIN_WAIT_MINUTES = 30       # 等待重新登录的最长时间(分钟)，超时后结束本次运行
+
+    # 并发配置
+    WORKER_COUNT = 1                    # 并发浏览器数量，1表示单浏览器顺序处理
+    WORKER_PROFILE_DIR = "worker_profiles"  # 各工作者复制的浏览器配置目录
+
+    # 异步流水线配置
+    RUN_MODE = "sync"            # sync: 按批次顺序处理; async: asyncio流水线，令牌桶限速代替批次暂停
+    ASYNC_CONCURRENCY = 8        # 最大并发任务数（浏览器流程的并发还受WORKER_COUNT限制）
+    RATE_LIMIT = 1.0             # 初始每秒请求数
+    RATE_LIMIT_MIN = 0.1         # 自适应降速的下限
+    RATE_LIMIT_MAX = 5.0         # 自适应提速的上限
+    RATE_BURST = 3               # 令牌桶容量（允许的突发请求数）
+    RATE_INCREASE_STEP = 0.1     # 每次成功后增加的速率
+    RATE_DECREASE_FACTOR = 0.5   # 连续失败时速率乘以该系数
+    RATE_FAILURE_THRESHOLD = 2   # 连续失败(出错或结果为空)多少次后开始降速
+
+    # 断点续采配置
+    CHECKPOINT_DB = "checkpoint.db"  # 采集进度记录文件
+    RESUME = True                    # 是否继续上次未完成的采集任务
+    SKIP_FRESH = False               # 是否跳过数据仍然新鲜的昵称
+    FRESH_MAX_AGE_DAYS = 1           # 数据新鲜的最大天数
+
+    # 达人ID缓存配置
+    CREATOR_CACHE_ENABLED = True            # 是否缓存昵称对应的达人ID/详情页，后续运行跳过搜索
+    CREATOR_CACHE_DB = "creator_cache.db"   # 缓存文件
+    CREATOR_CACHE_TTL_DAYS = 30             # 缓存有效天数
+    CREATOR_CACHE_MAX_ENTRIES = 100000      # 最多缓存的昵称数，超出后淘汰最久未使用的
+
+    # 粉丝数据存储配置
+    FANS_DB = "fans_data.db"         # 按 昵称+日期 存储的粉丝数据（数据源）
+    FANS_EXPORT_ON_FINISH = True     # 运行结束后是否导出宽表到FANS_EXCEL_FILE（本次没有新数据时不导出）
+    FANS_INCREMENTAL = True          # 增量采集：跳过已是最新的达人，只写入新的日期
+    FANS_DATA_LAG_DAYS = 1           # 平台数据的延迟天数，最新日期不早于 今天-该天数 即视为最新
+    FANS_DATE_RANGE_PARAMS = None    # 直连接口的日期范围参数名，如 ('start_date', 'end_date')；为None时不传
+
+    # 接口响应归档配置
+    ARCHIVE_ENABLED = True                 # 是否归档每次捕获到的接口原始响应（压缩、按内容去重）
+    ARCHIVE_DB = "response_archive.db"     # 归档文件，可用 python replay.py 从归档重新提取数据
+
+    # TGI存储与分析配置
+    TGI_DB = "tgi_data.db"                   # 完整的城市等级TGI向量
+    TGI_ANALYTICS_FILE = "TgiAnalytics.xlsx" # 批量计算的TGI指标
+    TGI_ANALYTICS_ON_FINISH = True           # 运行结束后是否重新计算TGI指标（本次没有新数据时不计算）
+    TGI_TIER_WEIGHTS = None                  # 加权均值的权重 {城市等级: 权重}，如 {'一线城市': 0.2, ...}；为None时等权
+
+    # 查询服务配置
+    QUERY_HOST = "127.0.0.1"      # 只读查询服务的监听地址
+    QUERY_PORT = 8765             # 只读查询服务的端口
+    QUERY_RELOAD_INTERVAL = 5     # 检查采集器是否写入了新数据的间隔(秒)
+    QUERY_MAX_LIMIT = 1000        # 单次查询最多返回的达人数
+
+    # 结果写入配置
+    FLUSH_ROWS = 50      # 累计更新多少个昵称后写回Excel
+    FLUSH_INTERVAL = 60  # 距上次写回超过多少秒后写回Excel(秒)
+
+    # 直连接口配置
+    FETCH_MODE = "browser"  # browser: 浏览器点击采集; api: 复用登录态直接请求接口，失败时回退到浏览器
+    # 搜索接口及参数以浏览器开发者工具中搜索页的实际请求为准
+    DAREN_SEARCH_API_URL = "https://trendinsight.oceanengine.com/api/v2/daren/search_great_user"
+    API_SEARCH_RESULT_PATH = ('list',)  # 搜索结果列表在data中的路径
+    API_USER_ID_FIELD = "user_id"       # 搜索结果中达人ID字段
+    API_USER_ID_PARAM = "user_id"       # 数据接口中达人ID参数名
+    API_METHOD = "POST"
+    API_TIMEOUT = 10       # 单次请求超时时间(秒)
+    API_POOL_SIZE = 10     # 连接池大小
+    API_MAX_RETRIES = 2    # 连接失败/5xx时的重试次数
+
+    # 运行指标配置
+    METRICS_ENABLED = True   # 是否统计各阶段耗时并在运行结束时输出
+    METRICS_FILE = None      # 指标输出文件（.json或.csv），为None时只输出到日志
+    PERFORMANCE_LOG_DUMP = None  # 把原始性能日志追加到该文件（如 "perf_log.jsonl"），供 log_benchmark.py 离线测试日志扫描速度
 
     # CSS选择器配置
     SELECTORS = {
         'loading': '.loading-spinner',
         'search_result': '.item-p2pF9O',
+        'empty_result': None,  # 搜索无结果时显示的元素，配置后无结果的昵称不必等到超时；未配置时只有搜索接口返回空列表才判定无结果
         'daren_detail': '.daren-CJ5hTJ',
         'fans_profile': 'div.item-a_379S:nth-child(3)',
         'data_container': '.fans-portrait-container'
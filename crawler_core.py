@@ -0,0 +1,698 @@
+# crawler_core.py
+import os
+import time
+import logging
+import itertools
+import pandas as pd
+from urllib.parse import quote
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+from config import Config
+from browser_session import create_driver, shutdown_browser, export_session_cookies, load_session_cookies
+from browser_lifecycle import BrowserLifecycle
+from api_client import DarenApiClient, ApiError, search_results
+from worker_pool import WorkerPool
+from async_runner import AsyncPipeline
+from network_capture import NetworkCapture
+from creator_cache import CreatorCache
+from response_archive import ResponseArchive
+from nickname_source import NicknameSource, BatchSource, chunk_unique
+from scheduler import RefreshScheduler
+from failures import (
+    TIMEOUT, NOT_FOUND, LOGIN_EXPIRED, SELECTOR_CHANGED, ERROR, CollectFailure,
+    RetryQueue, LoginGate, classify_exception, is_login_page, is_login_expired_response)
+from metrics import metrics
+
+
+class BaseCrawler:
+    """通用达人数据采集引擎：每个达人只打开一次详情页，由各提取器采集各自的数据"""
+
+    def __init__(self, extractors, user_data_dir=None, debugger_port=None):
+        """
+        Args:
+            extractors: 提取器列表，见extractors.py
+            user_data_dir: Chrome用户数据目录，默认使用Config.CHROME_USER_DATA_DIR
+            debugger_port: 常驻浏览器的调试端口，默认按Config.BROWSER_MODE决定
+        """
+        self.base_url = Config.BASE_URL
+        self.search_base_url = Config.SEARCH_BASE_URL
+        # 打开详情页即可获取的数据排在前面，其余按需点击对应标签
+        self.extractors = sorted(extractors, key=lambda extractor: extractor.tab_selector is not None)
+        self.api_client = None
+        self.creator_cache = CreatorCache() if Config.CREATOR_CACHE_ENABLED else None
+        self.archive = ResponseArchive() if Config.ARCHIVE_ENABLED else None
+        # 失败分类、重试队列和登录状态由所有浏览器共用
+        self.failures = {}
+        self.retry_queue = RetryQueue()
+        self.login_gate = LoginGate()
+
+        # 初始化浏览器驱动
+        self.user_data_dir = user_data_dir
+        if debugger_port is None and Config.BROWSER_MODE == 'attach':
+            debugger_port = Config.DEBUGGER_PORT
+        self.debugger_port = debugger_port
+        self.lifecycle = BrowserLifecycle()
+        try:
+            logging.info("初始化Chrome WebDriver")
+            self._start_driver()
+            logging.info("Chrome WebDriver初始化完成")
+        except Exception as e:
+            logging.error(f"初始化浏览器驱动失败: {str(e)}")
+            raise
+
+    def _start_driver(self):
+        """启动（或连接）浏览器并安装网络捕获"""
+        self.driver = create_driver(self.user_data_dir, self.debugger_port)
+        self.waits = {}
+        # 同时捕获搜索接口，接口返回空列表时可以立即判定无搜索结果
+        self.network_capture = NetworkCapture(
+            self.driver, [extractor.api_url for extractor in self.extractors] + [Config.DAREN_SEARCH_API_URL])
+        self.network_capture.install()
+
+    def _recycle_browser(self, reason):
+        """重启浏览器释放内存：精简模式先保存Cookie，其余模式的登录态保存在用户数据目录中"""
+        logging.info(f"{reason}，重启浏览器 (第 {self.lifecycle.restarts + 1} 次)")
+        with metrics.stage('browser_restart'):
+            if Config.LEAN_BROWSER:
+                self._save_session()
+            shutdown_browser(self.driver, self.debugger_port)
+            del self.driver
+            self._start_driver()
+        self.lifecycle.restarted()
+
+    def _after_creator(self):
+        """每个达人处理完后清空积压的性能日志；导航次数或内存超过阈值时重启浏览器"""
+        try:
+            self.network_capture.reset()
+            reason = self.lifecycle.check(self.driver)
+            if reason:
+                self._recycle_browser(reason)
+        except Exception as e:
+            logging.error(f"检查或重启浏览器时出错: {str(e)}")
+            # 关闭旧浏览器后启动失败，再试一次
+            self._ensure_driver()
+
+    def _ensure_driver(self):
+        """浏览器在重启时启动失败、当前没有可用浏览器时重新启动，返回浏览器是否可用"""
+        if hasattr(self, 'driver'):
+            return True
+        try:
+            self._start_driver()
+            return True
+        except Exception as e:
+            logging.error(f"重新启动浏览器失败: {str(e)}")
+            return False
+
+    def _navigate(self, url):
+        """打开页面并记录导航次数"""
+        with metrics.stage('navigate'):
+            self.driver.get(url)
+        self.lifecycle.record_navigation()
+
+    def spawn(self, user_data_dir, debugger_port=None):
+        """创建共用同一组提取器的新采集器（使用独立的浏览器）"""
+        crawler = BaseCrawler(self.extractors, user_data_dir=user_data_dir, debugger_port=debugger_port)
+        if crawler.creator_cache is not None:
+            crawler.creator_cache.close()
+        crawler.creator_cache = self.creator_cache
+        if crawler.archive is not None:
+            crawler.archive.close()
+        crawler.archive = self.archive
+        crawler.failures = self.failures
+        crawler.retry_queue = self.retry_queue
+        crawler.login_gate = self.login_gate
+        return crawler
+
+    def read_data(self):
+        """读取各提取器的结果Excel文件，返回合并后的昵称数据"""
+        frames = []
+        for extractor in self.extractors:
+            excel_file = extractor.excel_file
+            try:
+                if not os.path.exists(excel_file):
+                    logging.error(f"错误：找不到文件 {excel_file}")
+                    return None
+
+                df = extractor.result_store.load()
+                extractor.on_load(df)
+                logging.info(f"成功读取 {excel_file} 的'{Config.SHEET_NAME}'工作表")
+                logging.info(f"工作表包含 {len(df)} 行数据")
+                logging.info(f"列名：{list(df.columns)}")
+                frames.append(df)
+
+            except Exception as e:
+                logging.error(f"读取文件 {excel_file} 时发生错误: {str(e)}")
+                return None
+
+        if len(frames) == 1:
+            return frames[0]
+        return pd.concat(
+            [df[[Config.NICKNAME_COLUMN]] for df in frames if Config.NICKNAME_COLUMN in df.columns],
+            ignore_index=True)
+
+    def _empty_results(self):
+        """所有提取器均未成功的结果"""
+        return {extractor.name: False for extractor in self.extractors}
+
+    @staticmethod
+    def _merge_results(results, fallback_results):
+        """合并直连接口和浏览器流程的结果，任一成功即视为成功"""
+        return {name: success or fallback_results.get(name, False) for name, success in results.items()}
+
+    def _record_results(self, nickname, results):
+        """记录各提取器的处理结果，失败的昵称按失败类型加入重试队列，返回是否全部成功"""
+        for extractor in self.extractors:
+            extractor.checkpoint.record(nickname, results.get(extractor.name, False))
+        success = all(results.values())
+        metrics.count_creator(success)
+
+        kind = self.failures.pop(nickname, None)
+        if success:
+            self.retry_queue.resolve(nickname)
+        elif self.retry_queue.add(nickname, kind or ERROR):
+            logging.info(f"昵称 {nickname} 失败（{kind or ERROR}），将在本次运行末尾重试")
+        return success
+
+    def _note_failure(self, nickname, kind, inspect_page=True):
+        """
+        记录昵称的失败类型；停留在登录页时视为登录失效并暂停所有浏览器。
+        inspect_page为False时（直连接口的失败）只按HTTP响应分类，不操作可能正被其他线程使用的浏览器，
+        登录失效由随后占用浏览器的流程暂停处理
+        """
+        if inspect_page and kind != LOGIN_EXPIRED and self._on_login_page():
+            kind = LOGIN_EXPIRED
+        if self.failures.get(nickname) != LOGIN_EXPIRED:
+            self.failures[nickname] = kind
+        if kind == LOGIN_EXPIRED and inspect_page:
+            self.login_gate.pause(self._check_login)
+
+    def _on_login_page(self):
+        """当前页面是否为登录页"""
+        try:
+            return is_login_page(self.driver.current_url)
+        except Exception:
+            return False
+
+    def _check_login(self):
+        """重新打开平台页面检查是否已登录，精简模式下先重新载入Cookie文件"""
+        if Config.LEAN_BROWSER:
+            load_session_cookies(self.driver)
+        self.driver.get(self.base_url)
+        if self._on_login_page():
+            return False
+        if self.api_client is not None:
+            self.api_client.load_browser_session(self.driver)
+        return True
+
+    @metrics.timed('creator_total')
+    def search_nickname(self, nickname):
+        """根据昵称采集所有提取器的数据，返回是否全部成功"""
+        if not self.login_gate.wait():
+            return False
+        results = self._empty_results()
+        if Config.FETCH_MODE == 'api':
+            results = self._fetch_via_api(nickname)
+        if self._needs_browser(nickname, results):
+            results = self._merge_results(results, self._search_in_browser(nickname))
+        return self._record_results(nickname, results)
+
+    def _cached_creator(self, nickname):
+        """查询昵称对应的达人缓存"""
+        if self.creator_cache is None:
+            return None
+        return self.creator_cache.get(nickname)
+
+    def _search_in_browser(self, nickname):
+        """通过浏览器获取数据，处理完后检查浏览器是否需要重启"""
+        if not self._ensure_driver():
+            # 浏览器无法启动时记为失败，留到运行末尾重试，不让整个运行退出
+            self._note_failure(nickname, ERROR, inspect_page=False)
+            return self._empty_results()
+        if self.failures.get(nickname) == LOGIN_EXPIRED:
+            # 直连接口返回登录失效，在占用本浏览器的线程中暂停并检查登录状态
+            self.login_gate.pause(self._check_login)
+            if not self.login_gate.wait():
+                return self._empty_results()
+        try:
+            return self._browse(nickname)
+        finally:
+            self._after_creator()
+
+    def _up_to_date(self, nickname):
+        """数据已是最新、本次不必请求的提取器名称"""
+        return {extractor.name for extractor in self.extractors if extractor.is_up_to_date(nickname)}
+
+    @staticmethod
+    def _fetched_any(results, skipped):
+        """
+        实际发出请求的提取器中是否有成功的；跳过的提取器结果为True，不能说明缓存的URL/ID仍然有效
+        """
+        requested = [success for name, success in results.items() if name not in skipped]
+        return not requested or any(requested)
+
+    def _browse(self, nickname):
+        """有缓存的详情页URL时直接打开，否则搜索后打开详情页"""
+        cached = self._cached_creator(nickname)
+        if cached and cached['detail_url']:
+            skipped = self._up_to_date(nickname)
+            results = self._open_cached_detail(nickname, cached['detail_url'], skipped)
+            if self._fetched_any(results, skipped):
+                return results
+            # 缓存的详情页不再返回数据，清除后重新搜索
+            self.creator_cache.invalidate(nickname)
+
+        original_handles = self.driver.window_handles
+        try:
+            logging.info(f"开始处理昵称: {nickname}")
+
+            # 访问搜索URL
+            encoded_nickname = quote(nickname)
+            search_url = self.search_base_url + encoded_nickname
+            self.network_capture.reset()
+            self._navigate(search_url)
+
+            # 获取搜索结果（结果渲染后立即返回，不等待加载指示器）
+            results = self._get_search_results(nickname)
+            if not results:
+                return self._empty_results()
+
+            return self._process_first_result(nickname)
+
+        except Exception as e:
+            self._handle_search_error(e, nickname, original_handles)
+            return self._empty_results()
+
+    def _open_cached_detail(self, nickname, detail_url, skipped=None):
+        """跳过搜索，直接打开缓存的达人详情页"""
+        try:
+            logging.info(f"使用缓存的详情页处理昵称: {nickname}")
+            self.network_capture.reset()
+            self._navigate(detail_url)
+            return self._collect_all(nickname, skipped)
+        except Exception as e:
+            logging.warning(f"打开 {nickname} 的缓存详情页失败: {str(e)}")
+            self._note_failure(nickname, classify_exception(e))
+            return self._empty_results()
+
+    def _get_api_client(self):
+        """获取直连接口客户端，首次使用时从浏览器会话复制登录态"""
+        if self.api_client is None:
+            # 先打开平台页面，确保能读取到该域名下的Cookie
+            self.driver.get(self.base_url)
+            self.api_client = DarenApiClient.from_driver(self.driver)
+        return self.api_client
+
+    def _fetch_via_api(self, nickname):
+        """通过直连接口获取数据，失败的提取器随后回退到浏览器流程"""
+        results = self._empty_results()
+        try:
+            client = self._get_api_client()
+            skipped = self._up_to_date(nickname)
+            cached = self._cached_creator(nickname)
+            if cached and cached['user_id']:
+                results = self._fetch_extractors(nickname, client, cached['user_id'], skipped)
+                if self._fetched_any(results, skipped):
+                    return results
+                # 缓存的ID不再返回数据，清除后重新解析
+                self.creator_cache.invalidate(nickname)
+
+            user_id = client.resolve_user_id(nickname)
+            results = self._fetch_extractors(nickname, client, user_id, skipped)
+            if self._fetched_any(results, skipped) and self.creator_cache is not None:
+                self.creator_cache.put(nickname, user_id=user_id)
+
+        except Exception as e:
+            logging.warning(f"直连接口获取 {nickname} 的数据失败，回退到浏览器流程: {str(e)}")
+            if isinstance(e, ApiError) and e.status in (401, 403):
+                self._note_failure(nickname, LOGIN_EXPIRED, inspect_page=False)
+            elif isinstance(e, ApiError) and e.not_found:
+                self._note_failure(nickname, NOT_FOUND, inspect_page=False)
+        return results
+
+    def _needs_browser(self, nickname, results):
+        """直连接口未取全数据时需要回退到浏览器流程，接口已确认无搜索结果的昵称除外"""
+        return not all(results.values()) and self.failures.get(nickname) != NOT_FOUND
+
+    def _fetch_extractors(self, nickname, client, user_id, skipped):
+        """用达人ID请求各提取器的接口，skipped中的提取器数据已是最新，不再请求"""
+        results = self._empty_results()
+        for extractor in self.extractors:
+            if extractor.name in skipped:
+                results[extractor.name] = True
+                continue
+            try:
+                with metrics.stage('api_fetch'):
+                    data = client.fetch(extractor.api_url, user_id, extractor.request_params(nickname))
+                results[extractor.name] = self._process_response(
+                    nickname, extractor, {'data': data}, inspect_page=False)
+            except Exception as e:
+                logging.warning(f"直连接口获取 {nickname} 的{extractor.label}失败: {str(e)}")
+        return results
+
+    def _wait(self, step):
+        """
+        按步骤的超时预算创建显式等待，以WAIT_POLL_INTERVAL检查条件，满足后立即返回
+        Args:
+            step: STEP_TIMEOUTS中的步骤名
+        """
+        if step not in self.waits:
+            self.waits[step] = WebDriverWait(
+                self.driver, Config.STEP_TIMEOUTS.get(step, Config.WAIT_TIMEOUT),
+                poll_frequency=Config.WAIT_POLL_INTERVAL)
+        return self.waits[step]
+
+    @metrics.timed('search_results')
+    def _get_search_results(self, nickname):
+        """
+        等待搜索结果出现，返回搜索结果列表。
+        只有出现无结果提示或搜索接口返回空列表时才判定为无搜索结果，单纯超时按超时处理，之后会重试
+        """
+        def settled(driver):
+            results = driver.find_elements(By.CSS_SELECTOR, Config.SELECTORS['search_result'])
+            if results:
+                return results
+            if Config.SELECTORS.get('empty_result') and driver.find_elements(
+                    By.CSS_SELECTOR, Config.SELECTORS['empty_result']):
+                return True
+            return self._search_response_empty()
+
+        try:
+            results = self._wait('search_results').until(settled)
+            if isinstance(results, list):
+                return results
+            logging.warning(f"昵称 {nickname} 没有搜索结果")
+            self._note_failure(nickname, NOT_FOUND)
+            return []
+        except TimeoutException:
+            logging.warning(f"{Config.STEP_TIMEOUTS['search_results']}秒内未等到 {nickname} 的搜索结果")
+            self._note_failure(nickname, TIMEOUT)
+            return []
+        except Exception as e:
+            logging.error(f"获取搜索结果时出错: {str(e)}")
+            self._note_failure(nickname, classify_exception(e))
+            return []
+
+    def _search_response_empty(self):
+        """页面请求的搜索接口是否已返回空的搜索结果列表"""
+        response_data = self.network_capture.peek(Config.DAREN_SEARCH_API_URL)
+        if not isinstance(response_data, dict) or not isinstance(response_data.get('data'), dict):
+            return False
+        results = search_results(response_data['data'])
+        return results is not None and len(results) == 0
+
+    def _process_first_result(self, nickname):
+        """
+        打开搜索结果中的第一个达人详情，依次采集各提取器的数据
+        Args:
+            nickname: 达人昵称
+        """
+        try:
+            # 点击达人详情按钮
+            self._click_daren_detail(nickname)
+
+            skipped = self._up_to_date(nickname)
+            results = self._collect_all(nickname, skipped)
+            # 等到接口响应后详情页已完成跳转，此时的URL才是详情页地址
+            detail_url = self.driver.current_url
+            if self._fetched_any(results, skipped) and self.creator_cache is not None \
+                    and not detail_url.startswith(self.search_base_url):
+                self.creator_cache.put(nickname, detail_url=detail_url)
+            return results
+
+        except Exception as e:
+            logging.error(f"处理达人详情时发生错误: {str(e)}")
+            raise
+        finally:
+            self._clean_up_windows()
+
+    @metrics.timed('detail_click')
+    def _click_daren_detail(self, nickname):
+        """点击达人详情按钮"""
+        logging.info(f"开始处理昵称: {nickname} 的达人详情")
+        try:
+            daren_detail_button = self._wait('detail_button').until(
+                EC.element_to_be_clickable((By.CSS_SELECTOR, Config.SELECTORS['daren_detail']))
+            )
+        except TimeoutException:
+            # 搜索结果已出现但找不到详情按钮
+            raise CollectFailure(SELECTOR_CHANGED, f"找不到达人详情按钮 {Config.SELECTORS['daren_detail']}")
+
+        self._scroll_and_click(daren_detail_button)
+        logging.info(f"已点击 {nickname} 的达人详情按钮")
+
+    @metrics.timed('tab_click')
+    def _click_tab(self, nickname, selector):
+        """点击详情页中的标签（如粉丝画像）"""
+        try:
+            tab_button = self._wait('tab').until(
+                EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
+            )
+        except TimeoutException:
+            raise CollectFailure(SELECTOR_CHANGED, f"找不到详情页标签 {selector}")
+
+        self._scroll_and_click(tab_button)
+        logging.info(f"已点击 {nickname} 的标签 {selector}")
+
+    def _collect_all(self, nickname, skipped=None):
+        """在详情页上依次采集各提取器的数据，需要时点击对应标签；skipped中的提取器数据已是最新"""
+        if skipped is None:
+            skipped = self._up_to_date(nickname)
+        results = {}
+        for extractor in self.extractors:
+            if extractor.name in skipped:
+                # 合并采集时其他提取器仍需要打开详情页，已是最新的数据不必等待
+                results[extractor.name] = True
+                continue
+            if extractor.tab_selector:
+                self._click_tab(nickname, extractor.tab_selector)
+            results[extractor.name] = self._collect(nickname, extractor)
+        return results
+
+    def _collect(self, nickname, extractor):
+        """等待提取器的目标接口响应并处理，响应到达即继续，不再等待页面加载完成"""
+        with metrics.stage('response_wait'):
+            response_data = self.network_capture.wait_for(extractor.api_url)
+        if response_data is None:
+            logging.warning(f"等待 {nickname} 的{extractor.label}接口响应超时")
+            self._note_failure(nickname, TIMEOUT)
+            return False
+        return self._process_response(nickname, extractor, response_data)
+
+    def _process_response(self, nickname, extractor, response_data, inspect_page=True):
+        """归档原始响应后交给提取器处理，inspect_page见_note_failure"""
+        if self.archive is not None:
+            try:
+                self.archive.put(nickname, extractor.api_url, response_data)
+            except Exception as e:
+                logging.error(f"归档 {nickname} 的{extractor.label}接口响应时出错: {str(e)}")
+        if is_login_expired_response(response_data):
+            logging.error(f"{extractor.label}接口返回登录失效: {str(response_data)[:200]}")
+            self._note_failure(nickname, LOGIN_EXPIRED, inspect_page)
+            return False
+        if extractor.process(nickname, response_data):
+            return True
+        self._note_failure(nickname, ERROR, inspect_page)
+        return False
+
+    def _scroll_and_click(self, element):
+        """滚动到元素位置并点击"""
+        self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
+        self.driver.execute_script("arguments[0].click();", element)
+
+    def _clean_up_windows(self):
+        """清理浏览器窗口"""
+        if len(self.driver.window_handles) > 1:
+            self.driver.close()
+            self.driver.switch_to.window(self.driver.window_handles[0])
+
+    def _handle_search_error(self, error, nickname, original_handles):
+        """处理搜索过程中的错误：记录失败类型，供本次运行末尾重试"""
+        logging.error(f"搜索昵称 {nickname} 时发生错误: {str(error)}")
+        logging.error(f"错误类型: {type(error).__name__}")
+        self._note_failure(nickname, classify_exception(error))
+
+        # 恢复到原始状态
+        if len(self.driver.window_handles) > len(original_handles):
+            logging.info("检测到多余标签页，正在关闭...")
+            self.driver.close()
+            self.driver.switch_to.window(original_handles[0])
+            logging.info("已恢复到原始标签页")
+
+    def process_nicknames(self, df):
+        """处理所有昵称：按块读取、去重、过滤后立即分发，不必等整个列表准备完成"""
+        if df is None:
+            logging.error("没有数据可处理")
+            return
+
+        batch = None
+        if Config.BATCH_INPUTS:
+            # 批量模式：多个文件、工作表合并去重后只采集一次
+            batch = BatchSource()
+            chunks = batch.chunks()
+            total = None
+        elif Config.INPUT_FILE:
+            chunks = NicknameSource(Config.INPUT_FILE, Config.INPUT_SHEET).chunks()
+            total = None
+            logging.info(f"从 {Config.INPUT_FILE} 流式读取昵称")
+        else:
+            if df.empty:
+                logging.error("没有数据可处理")
+                return
+            if Config.NICKNAME_COLUMN not in df.columns:
+                logging.error(f"错误：找不到'{Config.NICKNAME_COLUMN}'列")
+                logging.error(f"可用的列名：{list(df.columns)}")
+                return
+            chunks = chunk_unique(df[Config.NICKNAME_COLUMN])
+            total = df[Config.NICKNAME_COLUMN].nunique()
+            logging.info(f"共找到 {total} 个不重复昵称")
+
+        self._start_runs(total)
+        pending = self._pending_chunks(chunks)
+        if Config.SCHEDULER_ENABLED:
+            # 调度需要比较所有达人的得分，先收集全部待采集的昵称
+            scheduler = RefreshScheduler(self.extractors)
+            scheduler.build([nickname for chunk in pending for nickname in chunk])
+            pending = scheduler.chunks()
+        first = next(pending, None)
+        if first is None:
+            logging.info("没有需要采集的昵称")
+        else:
+            pending = itertools.chain([first], pending)
+            if Config.RUN_MODE == 'async':
+                AsyncPipeline(self).run(pending)
+            elif Config.WORKER_COUNT > 1:
+                WorkerPool(self).run(pending)
+            else:
+                self._process_in_batches(pending)
+            self._retry_failed()
+
+        if self.login_gate.aborted:
+            logging.warning("登录失效未恢复，本次任务未完成，进度已保留，下次运行将从中断处继续")
+        else:
+            self._finish_runs()
+        if batch is not None:
+            # 已采集的达人也分发到结果文件，每个输入文件只写一次
+            batch.write_results([extractor.result_frame() for extractor in self.extractors])
+
+    def _process_in_batches(self, chunks):
+        """单浏览器按批次顺序处理各块昵称"""
+        processed = 0
+        for chunk in chunks:
+            for i in range(0, len(chunk), Config.BATCH_SIZE):
+                batch = chunk[i:i + Config.BATCH_SIZE]
+                if processed:
+                    logging.info(f"批次处理完成，暂停{Config.BATCH_INTERVAL}秒...")
+                    time.sleep(Config.BATCH_INTERVAL)
+                logging.info(f"\n开始处理第 {processed + 1}-{processed + len(batch)} 个昵称")
+
+                for nickname in batch:
+                    if self.login_gate.aborted:
+                        return
+                    self.search_nickname(nickname)
+                processed += len(batch)
+
+    def _retry_failed(self):
+        """在本次运行末尾按退避时间重试失败的昵称，最后按失败类型汇总仍失败的昵称"""
+        if len(self.retry_queue):
+            logging.info(f"\n开始重试 {len(self.retry_queue)} 个失败的昵称")
+        while not self.login_gate.aborted:
+            nickname = self.retry_queue.next_ready()
+            if nickname is None:
+                break
+            logging.info(f"重试昵称: {nickname}")
+            self.search_nickname(nickname)
+        self.retry_queue.report()
+
+    def _start_runs(self, total):
+        """开始（或继续）各提取器的采集任务，读取本次任务中已完成的昵称"""
+        self._completed = {}
+        for extractor in self.extractors:
+            extractor.checkpoint.start_run(total)
+            self._completed[extractor.name] = extractor.checkpoint.completed()
+
+    def _pending_chunks(self, chunks):
+        """
+        逐块过滤出需要采集的昵称；使用INPUT_FILE或批量模式时先把结果表中没有的昵称追加进去。
+        批量模式追加的昵称只在内存中参与采集，结果写入BATCH_OUTPUT_DIR，不写进主结果表
+        """
+        skipped = 0
+        transient = bool(Config.BATCH_INPUTS)
+        for chunk in chunks:
+            if Config.INPUT_FILE or Config.BATCH_INPUTS:
+                for extractor in self.extractors:
+                    added = extractor.result_store.add_nicknames(chunk, transient=transient)
+                    if added and not transient:
+                        logging.info(f"已向 {extractor.excel_file} 追加 {added} 个新昵称")
+
+            pending = self._filter_pending(chunk)
+            skipped += len(chunk) - len(pending)
+            if pending:
+                yield pending
+        if skipped:
+            logging.info(f"共跳过 {skipped} 个已完成或数据新鲜的昵称")
+
+    def _filter_pending(self, nicknames):
+        """
+        跳过所有提取器在本次任务中都已完成或数据已是最新的昵称；开启SKIP_FRESH时还跳过数据仍然新鲜的提取器。
+        只要还有一个提取器需要该昵称的数据就保留它。
+        """
+        def needs(extractor, nickname):
+            if not extractor.result_store.has_nickname(nickname):
+                return False
+            if nickname in self._completed[extractor.name]:
+                return False
+            if extractor.is_up_to_date(nickname):
+                return False
+            return not (Config.SKIP_FRESH and extractor.is_fresh(nickname))
+
+        return [
+            nickname for nickname in nicknames
+            if any(needs(extractor, nickname) for extractor in self.extractors)
+        ]
+
+    def _finish_runs(self):
+        """标记各提取器的本次任务完成"""
+        for extractor in self.extractors:
+            extractor.checkpoint.finish_run()
+
+    def _save_session(self):
+        """精简模式下把运行中更新过的Cookie写回Cookie文件，保持登录态有效"""
+        try:
+            export_session_cookies(self.driver)
+        except Exception as e:
+            logging.warning(f"保存登录Cookie失败: {str(e)}")
+
+    def close(self):
+        """关闭浏览器"""
+        if hasattr(self, 'driver'):
+            self.driver.quit()
+            del self.driver
+            logging.info("浏览器已关闭")
+
+    def __del__(self):
+        """析构函数，确保关闭浏览器"""
+        self.close()
+
+    def run(self):
+        """运行主程序"""
+        metrics.reset()
+        df = self.read_data()
+        try:
+            self.process_nicknames(df)
+        finally:
+            for extractor in self.extractors:
+                extractor.close()
+            if self.api_client is not None:
+                self.api_client.close()
+            if self.creator_cache is not None:
+                self.creator_cache.close()
+            if self.archive is not None:
+                self.archive.close()
+            if Config.LEAN_BROWSER:
+                self._save_session()
+            if Config.METRICS_ENABLED:
+                metrics.report()
+                if Config.METRICS_FILE:
+                    metrics.dump(Config.METRICS_FILE)
@@ -0,0 +1,95 @@
+# creator_cache.py
+import time
+import sqlite3
+import logging
+import threading
+from config import Config
+
+
+class CreatorCache:
+    """昵称 -> 达人ID/详情页URL 的持久化缓存，带过期时间和LRU淘汰"""
+
+    def __init__(self, db_path=None, ttl_days=None, max_entries=None):
+        """
+        Args:
+            db_path: SQLite文件路径，默认使用Config.CREATOR_CACHE_DB
+            ttl_days: 缓存有效天数，默认使用Config.CREATOR_CACHE_TTL_DAYS
+            max_entries: 最多缓存的昵称数，默认使用Config.CREATOR_CACHE_MAX_ENTRIES
+        """
+        self.ttl = (ttl_days or Config.CREATOR_CACHE_TTL_DAYS) * 86400
+        self.max_entries = max_entries or Config.CREATOR_CACHE_MAX_ENTRIES
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path or Config.CREATOR_CACHE_DB, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS creators (
+                nickname TEXT PRIMARY KEY,
+                user_id TEXT,
+                detail_url TEXT,
+                resolved_at REAL NOT NULL,
+                last_used_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_creators_last_used ON creators (last_used_at);
+        """)
+        self.conn.commit()
+
+    def get(self, nickname):
+        """
+        查询未过期的缓存
+        Returns:
+            {'user_id': ..., 'detail_url': ...}，不存在或已过期时返回None
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT user_id, detail_url, resolved_at FROM creators WHERE nickname = ?",
+                (nickname,)).fetchone()
+            if row is None:
+                return None
+
+            user_id, detail_url, resolved_at = row
+            if time.time() - resolved_at > self.ttl:
+                self.conn.execute("DELETE FROM creators WHERE nickname = ?", (nickname,))
+                self.conn.commit()
+                return None
+
+            self.conn.execute(
+                "UPDATE creators SET last_used_at = ? WHERE nickname = ?", (time.time(), nickname))
+            self.conn.commit()
+            return {'user_id': user_id, 'detail_url': detail_url}
+
+    def put(self, nickname, user_id=None, detail_url=None):
+        """记录解析结果，只更新传入的字段"""
+        now = time.time()
+        with self._lock:
+            self.conn.execute(
+                "INSERT INTO creators (nickname, user_id, detail_url, resolved_at, last_used_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(nickname) DO UPDATE SET "
+                "user_id = COALESCE(excluded.user_id, user_id), "
+                "detail_url = COALESCE(excluded.detail_url, detail_url), "
+                "resolved_at = excluded.resolved_at, last_used_at = excluded.last_used_at",
+                (nickname, user_id, detail_url, now, now))
+            self._evict()
+            self.conn.commit()
+
+    def _evict(self):
+        """超出容量时淘汰最久未使用的记录"""
+        count = self.conn.execute("SELECT COUNT(*) FROM creators").fetchone()[0]
+        if count <= self.max_entries:
+            return
+        self.conn.execute(
+            "DELETE FROM creators WHERE nickname IN "
+            "(SELECT nickname FROM creators ORDER BY last_used_at LIMIT ?)",
+            (count - self.max_entries,))
+
+    def invalidate(self, nickname):
+        """删除失效的缓存（缓存的ID不再返回数据时调用）"""
+        with self._lock:
+            self.conn.execute("DELETE FROM creators WHERE nickname = ?", (nickname,))
+            self.conn.commit()
+        logging.info(f"已清除 {nickname} 的达人ID缓存")
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,285 @@
+# extractors.py
+import json
+import time
+import logging
+from datetime import datetime, timedelta
+import pandas as pd
+from config import Config
+from result_store import ExcelResultStore
+from checkpoint import Checkpoint
+from fans_store import FansStore
+from tgi_store import TgiStore
+from tgi_analytics import export_tgi_analytics
+
+
+class Extractor:
+    """数据提取器基类：定义目标接口、解析方式以及结果写入位置"""
+
+    name = None          # 数据类型，用于断点记录
+    label = None         # 日志中显示的数据名称
+    api_url = None       # 目标接口URL
+    excel_file = None    # 结果Excel文件
+    tab_selector = None  # 详情页中需要点击的标签，None表示打开详情页即会请求该接口
+    column_dtype = None  # 新建结果列的数据类型
+    output_columns = ()  # 提取器写入结果表的列，批量模式只把这些列分发回输入文件
+    replay_history = False  # 从归档重新提取时是否按时间顺序处理全部历史响应（否则每个昵称只取最新一次）
+    incremental = True      # 是否只保存比已有数据新的部分；从归档重放时关闭，以便修正历史数据
+
+    def __init__(self):
+        self.result_store = ExcelResultStore(self.excel_file, column_sorter=self.sort_columns)
+        self.checkpoint = Checkpoint(self.name)
+
+    def on_load(self, df):
+        """结果Excel文件读取完成后调用"""
+
+    def parse(self, data):
+        """从接口返回的data中解析出需要的数据"""
+        raise NotImplementedError
+
+    def log_details(self, nickname, parsed):
+        """记录解析出的数据详情"""
+
+    def to_values(self, parsed):
+        """把解析结果转换为 {列名: 值}"""
+        raise NotImplementedError
+
+    def sort_columns(self, df):
+        """写回Excel前调整列顺序"""
+        return df
+
+    def result_frame(self):
+        """本次运行的结果（含批量模式的临时昵称），只含昵称和提取器写入的列，用于分发回批量输入文件"""
+        df = self.result_store.df
+        if df is None:
+            return None
+        columns = [col for col in self.output_columns if col in df.columns]
+        return df[[Config.NICKNAME_COLUMN] + columns]
+
+    def is_fresh(self, nickname):
+        """结果表中该昵称的数据是否仍然新鲜"""
+        return False
+
+    def is_up_to_date(self, nickname):
+        """已有数据是否已是平台上最新的，是则无需请求"""
+        return False
+
+    def request_params(self, nickname):
+        """直连接口请求的额外参数"""
+        return {}
+
+    def process(self, nickname, response_data, verbose=True):
+        """处理接口响应并写入结果缓存，返回是否解析到数据；verbose为False时不记录数据详情"""
+        try:
+            parsed = self.parse(response_data['data'])
+            if not parsed:
+                return False
+
+            if verbose:
+                self.log_details(nickname, parsed)
+            self.save(nickname, parsed)
+            return True
+
+        except Exception as e:
+            logging.error(f"处理{self.label}接口响应时出错: {str(e)}")
+            return False
+
+    def save(self, nickname, parsed):
+        """更新结果缓存，由结果存储批量写回Excel，返回是否找到并更新了该昵称"""
+        try:
+            if self.result_store.update(nickname, self.to_values(parsed), dtype=self.column_dtype):
+                logging.info(f"已将 {nickname} 的{self.label}写入结果缓存")
+                return True
+            logging.warning(f"在Excel文件 {self.excel_file} 中未找到昵称 {nickname}")
+
+        except Exception as e:
+            logging.error(f"更新Excel文件时出错: {str(e)}")
+        return False
+
+    def close(self):
+        """写回未保存的结果并关闭断点记录"""
+        self.result_store.close()
+        self.checkpoint.close()
+
+
+class TgiExtractor(Extractor):
+    """粉丝画像中的城市等级TGI，结果为各等级TGI的平均值"""
+
+    name = 'tgi'
+    label = 'TGI均值'
+    api_url = Config.API_URL
+    excel_file = Config.TGI_EXCEL_FILE
+    tab_selector = Config.SELECTORS['fans_profile']
+    output_columns = (Config.TGI_COLUMN,)
+
+    def __init__(self):
+        super().__init__()
+        self.tgi_store = TgiStore()
+        self.updated = 0
+
+    def on_load(self, df):
+        """首次使用时把TgiData.xlsx中已有的TGI均值导入存储，查询服务无需等到重新采集"""
+        if not self.tgi_store.has_imported_means():
+            self.tgi_store.import_means(df)
+
+    def parse(self, data):
+        """解析城市等级TGI列表"""
+        return json.loads(data['CityLabel_Tgi'])
+
+    def log_details(self, nickname, city_label_tgi):
+        """记录TGI详情"""
+        logging.info(f"\n昵称 {nickname} 的城市等级TGI详情:")
+        for item in city_label_tgi:
+            logging.info(f"{item['name']}: {item['value']:.2f}")
+
+    def calculate_average(self, city_label_tgi):
+        """计算TGI平均值"""
+        tgi_values = [item['value'] for item in city_label_tgi]
+        average_tgi = sum(tgi_values) / len(tgi_values)
+
+        logging.info("\n总计算过程:")
+        logging.info(f"总和: {sum(tgi_values):.2f}")
+        logging.info(f"城市等级数量: {len(tgi_values)}")
+        logging.info(f"平均值: {average_tgi:.2f}")
+
+        return average_tgi
+
+    def to_values(self, city_label_tgi):
+        return {Config.TGI_COLUMN: self.calculate_average(city_label_tgi)}
+
+    def save(self, nickname, city_label_tgi):
+        """写入TGI均值，同时保存完整的城市等级TGI向量；批量模式的临时昵称不写入共用的存储"""
+        if not super().save(nickname, city_label_tgi):
+            return False
+        if self.result_store.is_transient(nickname):
+            return True
+        try:
+            self.tgi_store.upsert(nickname, city_label_tgi)
+            self.updated += 1
+        except Exception as e:
+            logging.error(f"写入TGI存储时出错: {str(e)}")
+        return True
+
+    def is_fresh(self, nickname):
+        """TGI均值已填写且在FRESH_MAX_AGE_DAYS天内成功采集过"""
+        row = self.result_store.get_row(nickname)
+        if row is None or Config.TGI_COLUMN not in row.index or pd.isna(row[Config.TGI_COLUMN]):
+            return False
+        last_success = self.checkpoint.last_success(nickname)
+        return last_success is not None and time.time() - last_success < Config.FRESH_MAX_AGE_DAYS * 86400
+
+    def close(self):
+        """本次有新数据时重新计算TGI指标，然后关闭存储"""
+        super().close()
+        if Config.TGI_ANALYTICS_ON_FINISH and self.updated:
+            try:
+                export_tgi_analytics(self.tgi_store)
+            except Exception as e:
+                logging.error(f"计算TGI指标时出错: {str(e)}")
+        self.tgi_store.close()
+
+
+class FansExtractor(Extractor):
+    """达人详情页的每日粉丝数据，按 昵称+日期 存入FansStore，FansData.xlsx为导出的宽表视图"""
+
+    name = 'fans'
+    label = '粉丝数据'
+    api_url = Config.FANS_API_URL
+    excel_file = Config.FANS_EXCEL_FILE
+    replay_history = True
+
+    def __init__(self):
+        super().__init__()
+        self.fans_store = FansStore()
+        self.updated = 0
+        self.transient_fans = {}  # 批量模式临时昵称的粉丝数据 {昵称: {日期: 粉丝数}}，只用于批量输出
+
+    def on_load(self, df):
+        """首次使用时把FansData.xlsx中已有的日期列导入存储"""
+        if self.fans_store.is_empty():
+            self.fans_store.import_wide(df)
+
+    def parse(self, data):
+        """解析每日粉丝列表"""
+        return data['fanslistday']
+
+    def log_details(self, nickname, fans_data):
+        """记录粉丝数据详情"""
+        logging.info(f"\n昵称 {nickname} 的粉丝数据详情:")
+        for item in fans_data:
+            logging.info(f"日期: {item['date']}, 数量: {item['count']}")
+
+    def save(self, nickname, fans_data):
+        """按 昵称+日期 写入存储；增量模式下只写入不早于已存最新日期的行（重放时写入全部行）"""
+        try:
+            if not self.result_store.has_nickname(nickname):
+                logging.warning(f"在Excel文件 {self.excel_file} 中未找到昵称 {nickname}")
+                return
+
+            if self.result_store.is_transient(nickname):
+                # 临时昵称不写入共用的存储，避免进入宽表导出和查询服务
+                self.transient_fans.setdefault(nickname, {}).update(
+                    {str(item['date']): int(item['count']) for item in fans_data})
+                return
+
+            if Config.FANS_INCREMENTAL and self.incremental:
+                latest_date = self.fans_store.latest_date(nickname)
+                if latest_date is not None:
+                    # 最新一天可能在上次采集后被平台修正，重新写入
+                    latest = latest_date.strftime('%Y%m%d')
+                    fans_data = [item for item in fans_data if str(item['date']) >= latest]
+
+            count = self.fans_store.upsert(nickname, fans_data)
+            self.updated += count
+            logging.info(f"已将 {nickname} 的 {count} 天粉丝数据写入存储")
+
+        except Exception as e:
+            logging.error(f"写入粉丝数据存储时出错: {str(e)}")
+
+    def is_fresh(self, nickname):
+        """已存储的最新日期距今不超过FRESH_MAX_AGE_DAYS天"""
+        latest_date = self.fans_store.latest_date(nickname)
+        return latest_date is not None and (datetime.now() - latest_date).days <= Config.FRESH_MAX_AGE_DAYS
+
+    def is_up_to_date(self, nickname):
+        """增量模式下，已存储的最新日期达到平台当前可提供的最新日期"""
+        if not Config.FANS_INCREMENTAL:
+            return False
+        latest_date = self.fans_store.latest_date(nickname)
+        available = datetime.now() - timedelta(days=Config.FANS_DATA_LAG_DAYS)
+        return latest_date is not None and latest_date.date() >= available.date()
+
+    def request_params(self, nickname):
+        """配置了日期范围参数时，只请求已存最新日期之后的数据"""
+        if not (Config.FANS_INCREMENTAL and Config.FANS_DATE_RANGE_PARAMS):
+            return {}
+        latest_date = self.fans_store.latest_date(nickname)
+        if latest_date is None:
+            return {}
+        start_param, end_param = Config.FANS_DATE_RANGE_PARAMS
+        return {
+            start_param: latest_date.strftime('%Y%m%d'),
+            end_param: datetime.now().strftime('%Y%m%d'),
+        }
+
+    def result_frame(self):
+        """粉丝数据以存储为准，只输出由存储生成的日期列；临时昵称使用本次运行保存在内存中的数据"""
+        if self.result_store.df is None:
+            return None
+        frame = self.fans_store.merge_wide(self.result_store.df[[Config.NICKNAME_COLUMN]])
+        if not self.transient_fans:
+            return frame
+
+        transient = pd.DataFrame.from_dict(self.transient_fans, orient='index')
+        frame = frame.set_index(Config.NICKNAME_COLUMN).combine_first(transient)
+        frame = frame[sorted(frame.columns)].astype('Int64')
+        return frame.rename_axis(Config.NICKNAME_COLUMN).reset_index()
+
+    def close(self):
+        """本次有新数据时导出宽表视图，然后关闭存储"""
+        super().close()
+        if Config.FANS_EXPORT_ON_FINISH and self.updated:
+            try:
+                self.fans_store.export_wide(self.excel_file)
+            except Exception as e:
+                logging.error(f"导出粉丝数据宽表时出错: {str(e)}")
+        self.fans_store.close()
@@ -0,0 +1,179 @@
+# failures.py
+import time
+import heapq
+import logging
+import threading
+from urllib.parse import urlparse
+from selenium.common.exceptions import (
+    TimeoutException, NoSuchElementException, InvalidSelectorException,
+    ElementNotInteractableException, StaleElementReferenceException)
+from config import Config
+
+
+# 失败类型
+TIMEOUT = 'timeout'                    # 页面或接口响应超时、网络错误（临时性，可重试）
+NOT_FOUND = 'not_found'                # 没有搜索结果
+LOGIN_EXPIRED = 'login_expired'        # 登录失效
+SELECTOR_CHANGED = 'selector_changed'  # 页面元素找不到，可能是页面改版
+ERROR = 'error'                        # 其他错误
+
+FAILURE_LABELS = {
+    TIMEOUT: '超时',
+    NOT_FOUND: '无搜索结果',
+    LOGIN_EXPIRED: '登录失效',
+    SELECTOR_CHANGED: '页面元素变化',
+    ERROR: '其他错误',
+}
+
+
+class CollectFailure(Exception):
+    """已判明类型的采集失败"""
+
+    def __init__(self, kind, message):
+        super().__init__(message)
+        self.kind = kind
+
+
+def is_login_page(url):
+    """URL是否为登录页，只检查域名和路径，查询参数中的昵称等内容不参与判断"""
+    parsed = urlparse(url or '')
+    location = f"{parsed.netloc}{parsed.path}".lower()
+    return any(marker in location for marker in Config.LOGIN_URL_MARKERS)
+
+
+def is_login_expired_response(response_data):
+    """接口响应是否表示登录失效"""
+    if not isinstance(response_data, dict) or response_data.get('data'):
+        return False
+    text = str({key: value for key, value in response_data.items() if key != 'data'})
+    return any(message in text for message in Config.LOGIN_EXPIRED_MESSAGES)
+
+
+def classify_exception(error):
+    """根据异常判断失败类型"""
+    if isinstance(error, CollectFailure):
+        return error.kind
+    if isinstance(error, TimeoutException):
+        return TIMEOUT
+    if isinstance(error, (NoSuchElementException, InvalidSelectorException,
+                          ElementNotInteractableException, StaleElementReferenceException)):
+        return SELECTOR_CHANGED
+    if 'net::' in str(error) or isinstance(error, OSError):
+        return TIMEOUT
+    return ERROR
+
+
+class RetryQueue:
+    """失败重试队列：按失败类型限制重试次数，重试间隔指数增长"""
+
+    def __init__(self, budgets=None, backoff=None, backoff_max=None):
+        """
+        Args:
+            budgets: {失败类型: 最多重试次数}，默认使用Config.RETRY_BUDGETS
+            backoff: 第一次重试前的等待时间(秒)，默认使用Config.RETRY_BACKOFF
+            backoff_max: 最长等待时间(秒)，默认使用Config.RETRY_BACKOFF_MAX
+        """
+        self.budgets = budgets or Config.RETRY_BUDGETS
+        self.backoff = Config.RETRY_BACKOFF if backoff is None else backoff
+        self.backoff_max = backoff_max or Config.RETRY_BACKOFF_MAX
+        self._lock = threading.Lock()
+        self._heap = []
+        self._attempts = {}
+        self.exhausted = {}
+
+    def add(self, nickname, kind):
+        """记录一次失败；仍有重试次数时加入队列，返回是否会重试"""
+        with self._lock:
+            attempts = self._attempts.get(nickname, 0)
+            if attempts >= self.budgets.get(kind, 0):
+                self.exhausted[nickname] = kind
+                return False
+            delay = min(self.backoff * 2 ** attempts, self.backoff_max)
+            self._attempts[nickname] = attempts + 1
+            self.exhausted.pop(nickname, None)
+            heapq.heappush(self._heap, (time.monotonic() + delay, nickname))
+            return True
+
+    def resolve(self, nickname):
+        """该昵称重试成功"""
+        with self._lock:
+            self.exhausted.pop(nickname, None)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def next_ready(self):
+        """等到下一个昵称的重试时间后返回它，队列为空时返回None"""
+        with self._lock:
+            if not self._heap:
+                return None
+            ready_at, nickname = heapq.heappop(self._heap)
+        delay = ready_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        return nickname
+
+    def report(self):
+        """输出最终仍失败的昵称，按失败类型分组"""
+        groups = {}
+        for nickname, kind in self.exhausted.items():
+            groups.setdefault(kind, []).append(nickname)
+        for kind, nicknames in groups.items():
+            preview = '、'.join(str(nickname) for nickname in nicknames[:10])
+            more = f" 等{len(nicknames)}个" if len(nicknames) > 10 else ''
+            logging.warning(f"{FAILURE_LABELS.get(kind, kind)}: {preview}{more}")
+        if len(groups.get(SELECTOR_CHANGED, [])) >= 3:
+            logging.error("多个昵称因页面元素找不到而失败，页面可能已改版，请检查config.py中的SELECTORS")
+        return groups
+
+
+class LoginGate:
+    """登录失效时暂停所有浏览器，等待重新登录后继续，超时则结束本次运行"""
+
+    def __init__(self):
+        self._open = threading.Event()
+        self._open.set()
+        self._lock = threading.Lock()
+        self._resumed_at = None
+        self.aborted = False
+
+    def wait(self):
+        """登录失效期间阻塞，返回是否可以继续采集"""
+        self._open.wait()
+        return not self.aborted
+
+    def pause(self, check_login):
+        """
+        暂停所有浏览器并定期检查是否已重新登录
+        Args:
+            check_login: 检查登录状态的函数，已登录时返回True
+        """
+        if not self._lock.acquire(blocking=False):
+            # 已有浏览器在等待重新登录
+            self._open.wait()
+            return
+        try:
+            if self.aborted:
+                return
+            if self._resumed_at and time.monotonic() - self._resumed_at < Config.LOGIN_CHECK_INTERVAL:
+                # 刚恢复登录，之前发出的请求失败不再重复暂停
+                return
+
+            self._open.clear()
+            logging.error("登录已失效，已暂停所有浏览器。请在浏览器中重新登录（精简模式下重新导出Cookie）")
+            deadline = time.monotonic() + Config.LOGIN_WAIT_MINUTES * 60
+            while time.monotonic() < deadline:
+                time.sleep(Config.LOGIN_CHECK_INTERVAL)
+                try:
+                    if check_login():
+                        logging.info("已重新登录，继续采集")
+                        self._resumed_at = time.monotonic()
+                        return
+                except Exception as e:
+                    logging.warning(f"检查登录状态时出错: {str(e)}")
+
+            self.aborted = True
+            logging.error(f"{Config.LOGIN_WAIT_MINUTES}分钟内未重新登录，结束本次运行")
+        finally:
+            self._open.set()
+            self._lock.release()
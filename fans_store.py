@@ -0,0 +1,145 @@
+# fans_store.py
+import time
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+import pandas as pd
+from config import Config
+from result_store import write_excel_atomic
+
+
+def parse_date_column(column):
+    """把日期列名（如20241212）解析为datetime，非日期列返回None"""
+    try:
+        return datetime.strptime(str(column), '%Y%m%d')
+    except ValueError:
+        return None
+
+
+class FansStore:
+    """按 昵称+日期 存储每日粉丝数据的长表（SQLite），宽表FansData.xlsx按需导出"""
+
+    def __init__(self, db_path=None):
+        """
+        Args:
+            db_path: SQLite文件路径，默认使用Config.FANS_DB
+        """
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path or Config.FANS_DB, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS fans_daily (
+                nickname TEXT NOT NULL,
+                date TEXT NOT NULL,
+                count INTEGER,
+                updated_at REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (nickname, date)
+            ) WITHOUT ROWID;
+        """)
+        # 旧版本的存储没有updated_at列，查询服务靠它增量刷新
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(fans_daily)")]
+        if 'updated_at' not in columns:
+            self.conn.execute("ALTER TABLE fans_daily ADD COLUMN updated_at REAL NOT NULL DEFAULT 0")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_fans_daily_updated ON fans_daily (updated_at)")
+        self.conn.commit()
+
+    def is_empty(self):
+        """是否还没有任何数据"""
+        with self._lock:
+            return self.conn.execute("SELECT 1 FROM fans_daily LIMIT 1").fetchone() is None
+
+    def upsert(self, nickname, fans_data):
+        """
+        写入一个达人的每日粉丝数据，已存在的日期覆盖
+        Args:
+            nickname: 达人昵称
+            fans_data: [{'date': ..., 'count': ...}, ...]
+        """
+        now = time.time()
+        rows = [(nickname, str(item['date']), int(item['count']), now) for item in fans_data]
+        with self._lock:
+            self.conn.executemany(
+                "INSERT INTO fans_daily (nickname, date, count, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(nickname, date) DO UPDATE SET count = excluded.count, updated_at = excluded.updated_at",
+                rows)
+            self.conn.commit()
+        return len(rows)
+
+    def latest_date(self, nickname):
+        """该达人已存储的最新日期，没有数据时返回None"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT MAX(date) FROM fans_daily WHERE nickname = ?", (nickname,)).fetchone()
+        return parse_date_column(row[0]) if row and row[0] else None
+
+    def import_wide(self, df):
+        """从宽表（每个日期一列）导入已有数据，用于首次迁移FansData.xlsx"""
+        if Config.NICKNAME_COLUMN not in df.columns:
+            return 0
+
+        date_columns = [col for col in df.columns if parse_date_column(col) is not None]
+        if not date_columns:
+            return 0
+
+        long_df = df[[Config.NICKNAME_COLUMN] + date_columns].melt(
+            id_vars=Config.NICKNAME_COLUMN, var_name='date', value_name='count').dropna()
+        now = time.time()
+        rows = [
+            (nickname, str(date), int(count), now)
+            for nickname, date, count in long_df.itertuples(index=False)
+        ]
+        with self._lock:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO fans_daily (nickname, date, count, updated_at) VALUES (?, ?, ?, ?)", rows)
+            self.conn.commit()
+        logging.info(f"已从宽表导入 {len(rows)} 条粉丝数据")
+        return len(rows)
+
+    def to_wide(self, nicknames=None):
+        """导出宽表：每个昵称一行、每个日期一列"""
+        with self._lock:
+            long_df = pd.read_sql_query("SELECT nickname, date, count FROM fans_daily", self.conn)
+        if nicknames is not None:
+            long_df = long_df[long_df['nickname'].isin(set(nicknames))]
+
+        wide = long_df.pivot(index='nickname', columns='date', values='count').astype('Int64')
+        return wide[sorted(wide.columns)]
+
+    def export_wide(self, excel_file=None, sheet_name=None):
+        """
+        按FansData.xlsx中的昵称列表导出宽表视图
+        保留原表中的非日期列（如'排名'、'昵称'），日期列全部由存储重新生成
+        """
+        excel_file = excel_file or Config.FANS_EXCEL_FILE
+        sheet_name = sheet_name or Config.SHEET_NAME
+
+        base = pd.read_excel(excel_file, sheet_name=sheet_name)
+        result = self.merge_wide(base)
+        write_excel_atomic(result, excel_file, sheet_name)
+        dates = len(result.columns) - len([col for col in base.columns if parse_date_column(col) is None])
+        logging.info(f"已导出 {len(result)} 个达人、{dates} 个日期的粉丝数据到 {excel_file}")
+
+    def merge_wide(self, base):
+        """保留base中的非日期列，按昵称附加存储中的全部日期列"""
+        fixed_columns = [col for col in base.columns if parse_date_column(col) is None]
+        base = base[fixed_columns]
+        wide = self.to_wide(base[Config.NICKNAME_COLUMN])
+        return base.merge(wide, left_on=Config.NICKNAME_COLUMN, right_index=True, how='left')
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self.conn.close()
+
+
+if __name__ == "__main__":
+    # 从存储导出宽表：python fans_store.py
+    logging.basicConfig(
+        level=Config.LOG_CONFIG['level'],
+        format=Config.LOG_CONFIG['format']
+    )
+    store = FansStore()
+    store.export_wide()
+    store.close()
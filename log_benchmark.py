@@ -0,0 +1,146 @@
+# log_benchmark.py
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+from config import Config
+from network_capture import NetworkCapture
+
+
+class ReplayDriver:
+    """回放记录的性能日志的假WebDriver，获取响应体时返回固定内容"""
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.body_fetches = 0
+
+    def get_log(self, log_type):
+        return self.entries
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.body_fetches += 1
+        return {'body': '{"data": {}}'}
+
+
+def legacy_scan(capture, logs):
+    """优化前的扫描方式：每条日志都完整解析JSON后再判断method和url"""
+    for entry in logs:
+        try:
+            message = json.loads(entry['message'])['message']
+        except (KeyError, ValueError):
+            continue
+
+        method = message.get('method')
+        params = message.get('params', {})
+        if method == 'Network.responseReceived':
+            target = capture._match(params['response']['url'])
+            if target:
+                capture._pending[params['requestId']] = target
+        elif method == 'Network.loadingFinished' and params.get('requestId') in capture._pending:
+            capture._fetch_body(params['requestId'])
+
+
+def load_dumps(paths):
+    """读取NetworkCapture记录的性能日志文件（每行一条）"""
+    entries = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            entries.extend(json.loads(line) for line in f if line.strip())
+    return entries
+
+
+def _entry(method, params):
+    """构造与ChromeDriver格式一致的性能日志条目"""
+    message = {'message': {'method': method, 'params': params}, 'webview': 'A1B2C3D4'}
+    return {'level': 'INFO', 'message': json.dumps(message, separators=(',', ':')), 'timestamp': 0}
+
+
+def generate_entries(count, target_urls, target_rate=0.01, seed=42):
+    """
+    生成与详情页加载相近的合成性能日志：大部分是静态资源和统计请求，少量是目标接口
+    Args:
+        count: 大致的日志条数
+        target_urls: 目标接口URL列表
+        target_rate: 请求中目标接口的比例
+    """
+    rng = random.Random(seed)
+    headers = {f"x-header-{i}": 'v' * rng.randint(20, 80) for i in range(12)}
+    stack = {'callFrames': [{'functionName': f"fn{i}", 'url': 'https://lf-cdn.example.com/app.js',
+                             'lineNumber': i, 'columnNumber': i * 7} for i in range(8)]}
+    entries = []
+    request_index = 0
+    while len(entries) < count:
+        request_index += 1
+        request_id = f"{1000 + request_index}.{rng.randint(1, 99)}"
+        if rng.random() < target_rate:
+            url = f"{rng.choice(target_urls)}?user_id={rng.randint(1, 10 ** 9)}"
+        else:
+            url = f"https://lf-cdn.example.com/static/{rng.randint(1, 10 ** 6)}.{rng.choice(['js', 'css', 'png', 'woff2'])}"
+        entries.append(_entry('Network.requestWillBeSent', {
+            'requestId': request_id, 'request': {'url': url, 'method': 'GET', 'headers': headers},
+            'initiator': {'type': 'script', 'stack': stack}, 'timestamp': request_index}))
+        entries.append(_entry('Network.responseReceived', {
+            'requestId': request_id, 'type': 'XHR',
+            'response': {'url': url, 'status': 200, 'headers': headers, 'mimeType': 'application/json'}}))
+        entries.append(_entry('Network.responseReceivedExtraInfo', {
+            'requestId': request_id, 'headers': headers}))
+        for _ in range(rng.randint(1, 4)):
+            entries.append(_entry('Network.dataReceived', {
+                'requestId': request_id, 'dataLength': rng.randint(100, 50000), 'encodedDataLength': 0}))
+        entries.append(_entry('Network.loadingFinished', {
+            'requestId': request_id, 'encodedDataLength': rng.randint(100, 50000)}))
+    return entries
+
+
+def measure(scan, entries, target_urls, repeat):
+    """多次扫描同一批日志，返回(最短耗时, 获取的目标响应体数)"""
+    best = None
+    fetched = 0
+    for _ in range(repeat):
+        driver = ReplayDriver(entries)
+        capture = NetworkCapture(driver, target_urls)
+        start = time.perf_counter()
+        scan(capture, entries)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        fetched = driver.body_fetches
+    return best, fetched
+
+
+def main():
+    parser = argparse.ArgumentParser(description="性能日志扫描速度测试（优化前后对比）")
+    parser.add_argument('dumps', nargs='*', help="PERFORMANCE_LOG_DUMP 记录的日志文件，不指定时使用合成日志")
+    parser.add_argument('--entries', type=int, default=100000, help="合成日志条数")
+    parser.add_argument('--target-rate', type=float, default=0.01, help="合成日志中目标接口请求的比例")
+    parser.add_argument('--repeat', type=int, default=5, help="重复次数，取最短耗时")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=Config.LOG_CONFIG['level'],
+        format=Config.LOG_CONFIG['format']
+    )
+
+    target_urls = [Config.API_URL, Config.FANS_API_URL]
+    if args.dumps:
+        entries = load_dumps(args.dumps)
+        logging.info(f"已读取 {len(entries)} 条记录的性能日志")
+    else:
+        entries = generate_entries(args.entries, target_urls, args.target_rate)
+        logging.info(f"已生成 {len(entries)} 条合成性能日志")
+    if not entries:
+        sys.exit("没有可测试的日志")
+
+    results = {
+        '完整解析': measure(legacy_scan, entries, target_urls, args.repeat),
+        '子串预过滤': measure(NetworkCapture.scan, entries, target_urls, args.repeat),
+    }
+    baseline = results['完整解析'][0]
+    logging.info(f"\n{'扫描方式':<10}{'耗时(秒)':>12}{'条目/秒':>14}{'目标响应':>10}{'加速比':>8}")
+    for name, (elapsed, fetched) in results.items():
+        logging.info(f"{name:<10}{elapsed:>12.3f}{len(entries) / elapsed:>14.0f}{fetched:>10}{baseline / elapsed:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
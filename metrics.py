@@ -0,0 +1,149 @@
+# metrics.py
+import csv
+import math
+import json
+import time
+import logging
+import threading
+from functools import wraps
+from contextlib import contextmanager
+from config import Config
+
+
+class RunMetrics:
+    """记录每个阶段的耗时，运行结束时汇总 p50/p95/max 和吞吐量"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """开始新一次运行的统计"""
+        with self._lock:
+            self._samples = {}
+            self._series = {}
+            self.started_at = time.monotonic()
+            self.creators = 0
+            self.succeeded = 0
+
+    def record(self, stage, seconds):
+        """记录一个阶段的耗时"""
+        if not Config.METRICS_ENABLED:
+            return
+        with self._lock:
+            self._samples.setdefault(stage, []).append(seconds)
+
+    def sample(self, name, value):
+        """记录随时间变化的数值（如浏览器内存），保存为 (运行秒数, 数值) 序列"""
+        if not Config.METRICS_ENABLED:
+            return
+        with self._lock:
+            self._series.setdefault(name, []).append((time.monotonic() - self.started_at, value))
+
+    @contextmanager
+    def stage(self, name):
+        """统计代码块耗时：with metrics.stage('navigate'): ..."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def timed(self, name):
+        """统计函数耗时的装饰器"""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def count_creator(self, success):
+        """记录处理完一个达人"""
+        with self._lock:
+            self.creators += 1
+            if success:
+                self.succeeded += 1
+
+    @staticmethod
+    def _percentile(sorted_values, percent):
+        """最近秩法计算百分位数"""
+        index = max(0, math.ceil(percent / 100 * len(sorted_values)) - 1)
+        return sorted_values[index]
+
+    def summary(self):
+        """汇总各阶段统计和吞吐量"""
+        with self._lock:
+            elapsed = time.monotonic() - self.started_at
+            stages = {}
+            for name, samples in self._samples.items():
+                values = sorted(samples)
+                stages[name] = {
+                    'count': len(values),
+                    'total': sum(values),
+                    'p50': self._percentile(values, 50),
+                    'p95': self._percentile(values, 95),
+                    'max': values[-1],
+                }
+            series = {}
+            for name, points in self._series.items():
+                values = [value for _, value in points]
+                series[name] = {
+                    'count': len(points),
+                    'first': values[0],
+                    'last': values[-1],
+                    'max': max(values),
+                    'points': list(points),
+                }
+            return {
+                'elapsed': elapsed,
+                'creators': self.creators,
+                'succeeded': self.succeeded,
+                'creators_per_minute': self.creators / elapsed * 60 if elapsed > 0 else 0.0,
+                'stages': stages,
+                'series': series,
+            }
+
+    def report(self):
+        """在日志中输出本次运行的阶段耗时和吞吐量"""
+        summary = self.summary()
+        logging.info(
+            f"\n运行指标: 共处理 {summary['creators']} 个达人（成功 {summary['succeeded']} 个），"
+            f"耗时 {summary['elapsed']:.1f}秒，吞吐量 {summary['creators_per_minute']:.1f} 个/分钟")
+        logging.info(f"{'阶段':<16}{'次数':>8}{'总耗时':>10}{'p50':>9}{'p95':>9}{'max':>9}")
+        for name, stats in sorted(summary['stages'].items(), key=lambda item: -item[1]['total']):
+            logging.info(
+                f"{name:<16}{stats['count']:>8}{stats['total']:>10.2f}"
+                f"{stats['p50']:>9.3f}{stats['p95']:>9.3f}{stats['max']:>9.3f}")
+        for name, stats in sorted(summary['series'].items()):
+            logging.info(
+                f"{name}: 采样 {stats['count']} 次，开始 {stats['first']:.1f}，"
+                f"结束 {stats['last']:.1f}，最大 {stats['max']:.1f}")
+        return summary
+
+    def dump(self, path):
+        """把汇总结果写入JSON或CSV文件，便于对比不同参数下的运行"""
+        summary = self.summary()
+        if path.endswith('.csv'):
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(['stage', 'count', 'total', 'p50', 'p95', 'max'])
+                for name, stats in summary['stages'].items():
+                    writer.writerow([name, stats['count'], stats['total'], stats['p50'], stats['p95'], stats['max']])
+                writer.writerow(['creators_per_minute', summary['creators'], summary['elapsed'],
+                                 summary['creators_per_minute'], '', ''])
+                if summary['series']:
+                    writer.writerow([])
+                    writer.writerow(['series', 'elapsed', 'value'])
+                    for name, stats in summary['series'].items():
+                        for elapsed, value in stats['points']:
+                            writer.writerow([name, round(elapsed, 3), value])
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(summary, f, ensure_ascii=False, indent=2)
+        logging.info(f"运行指标已写入 {path}")
+
+
+# 全局运行指标，各模块共用
+metrics = RunMetrics()
@@ -0,0 +1,268 @@
+# mock_site.py
+import json
+import time
+import zlib
+import random
+import logging
+import threading
+from datetime import datetime, timedelta
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, quote
+from config import Config
+
+
+SEARCH_PATH = urlparse(Config.SEARCH_BASE_URL).path
+DETAIL_PATH = "/arithmetic-index/daren/detail"
+TGI_API_PATH = urlparse(Config.API_URL).path
+FANS_API_PATH = urlparse(Config.FANS_API_URL).path
+SEARCH_API_PATH = urlparse(Config.DAREN_SEARCH_API_URL).path
+
+CITY_LEVELS = ['一线城市', '新一线城市', '二线城市', '三线城市', '四线城市', '五线城市']
+
+SEARCH_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>达人搜索</title></head>
+<body>
+<div class="loading-spinner">加载中</div>
+<div id="results"></div>
+<script>
+setTimeout(function () {
+    document.querySelector('.loading-spinner').remove();
+    %(render)s
+}, %(delay_ms)d);
+</script>
+</body></html>
+"""
+
+EMPTY_RESULT = """document.getElementById('results').innerHTML =
+    '<div class="empty-result">暂无搜索结果</div>';"""
+
+SEARCH_RESULT = """document.getElementById('results').innerHTML =
+    '<div class="item-p2pF9O"><span>%(nickname)s</span>' +
+    '<a class="daren-CJ5hTJ" href="%(detail_url)s">达人详情</a></div>';"""
+
+DETAIL_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>达人详情</title></head>
+<body>
+<div class="loading-spinner">加载中</div>
+<div class="tabs">
+    <div class="item-a_379S">概览</div>
+    <div class="item-a_379S">作品分析</div>
+    <div class="item-a_379S" id="fans-tab">粉丝画像</div>
+</div>
+<div class="fans-portrait-container"></div>
+<script>
+function post(path) {
+    return fetch(path, {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({user_id: %(user_id)s})
+    }).then(function (response) { return response.text(); });
+}
+post('%(fans_api)s').finally(function () {
+    document.querySelector('.loading-spinner').remove();
+});
+document.getElementById('fans-tab').addEventListener('click', function () {
+    post('%(tgi_api)s');
+});
+</script>
+</body></html>
+"""
+
+
+def user_id_for(nickname):
+    """按昵称生成固定的达人ID"""
+    return str(zlib.crc32(nickname.encode('utf-8')))
+
+
+class MockTrendSite:
+    """本地模拟的巨量算数站点：搜索页、详情页以及达人数据接口，可配置延迟和错误率"""
+
+    def __init__(self, latency=0.2, page_latency=0.3, error_rate=0.0, not_found_rate=0.0,
+                 host='127.0.0.1', port=0, seed=None):
+        """
+        Args:
+            latency: 接口平均响应延迟(秒)，实际延迟在0.5~1.5倍之间波动
+            page_latency: 搜索结果渲染的平均延迟(秒)
+            error_rate: 数据接口返回500的概率
+            not_found_rate: 昵称没有搜索结果的比例（按昵称固定）
+            host: 监听地址
+            port: 监听端口，0表示随机分配
+            seed: 随机数种子，便于复现
+        """
+        self.latency = latency
+        self.page_latency = page_latency
+        self.error_rate = error_rate
+        self.not_found_rate = not_found_rate
+        self.random = random.Random(seed)
+        self.stats = {}
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler_class())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        """站点根地址，如 http://127.0.0.1:8000"""
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def config_overrides(self):
+        """把Config中的站点地址指向本地模拟站点"""
+        return {
+            'BASE_URL': f"{self.url}/arithmetic-index?type=3",
+            'SEARCH_BASE_URL': f"{self.url}{SEARCH_PATH}?keyword=",
+            'API_URL': f"{self.url}{TGI_API_PATH}",
+            'FANS_API_URL': f"{self.url}{FANS_API_PATH}",
+            'DAREN_SEARCH_API_URL': f"{self.url}{SEARCH_API_PATH}",
+            'SELECTORS': {**Config.SELECTORS, 'empty_result': '.empty-result'},
+        }
+
+    def start(self):
+        """在后台线程中启动站点"""
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        logging.info(f"模拟站点已启动: {self.url}")
+        return self
+
+    def stop(self):
+        """停止站点"""
+        self.server.shutdown()
+        self.server.server_close()
+        logging.info("模拟站点已停止")
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] = self.stats.get(key, 0) + 1
+
+    def _delay(self, seconds):
+        """带波动的延迟"""
+        with self._lock:
+            factor = self.random.uniform(0.5, 1.5)
+        return seconds * factor
+
+    def _should_fail(self):
+        with self._lock:
+            return self.random.random() < self.error_rate
+
+    def is_found(self, nickname):
+        """该昵称是否有搜索结果"""
+        return zlib.crc32(nickname.encode('utf-8')) % 1000 >= self.not_found_rate * 1000
+
+    def search_page(self, nickname):
+        """搜索结果页，延迟后移除加载指示器并渲染结果"""
+        render = EMPTY_RESULT
+        if self.is_found(nickname):
+            detail_url = f"{DETAIL_PATH}?user_id={user_id_for(nickname)}"
+            render = SEARCH_RESULT % {
+                'nickname': escape(json.dumps(nickname)[1:-1]),
+                'detail_url': detail_url,
+            }
+        return SEARCH_PAGE % {'render': render, 'delay_ms': int(self._delay(self.page_latency) * 1000)}
+
+    def detail_page(self, user_id):
+        """达人详情页，打开时请求粉丝数据接口，点击粉丝画像标签时请求TGI接口"""
+        return DETAIL_PAGE % {
+            'user_id': json.dumps(user_id),
+            'fans_api': FANS_API_PATH,
+            'tgi_api': TGI_API_PATH,
+        }
+
+    @staticmethod
+    def tgi_data(user_id):
+        """城市等级TGI接口数据"""
+        rng = random.Random(f"tgi-{user_id}")
+        city_label_tgi = [{'name': name, 'value': round(rng.uniform(50, 150), 2)} for name in CITY_LEVELS]
+        return {'CityLabel_Tgi': json.dumps(city_label_tgi, ensure_ascii=False)}
+
+    @staticmethod
+    def fans_data(user_id, days=30):
+        """每日粉丝数接口数据，截止到今天"""
+        rng = random.Random(f"fans-{user_id}")
+        count = rng.randint(1000, 1000000)
+        today = datetime.now()
+        fanslistday = []
+        for offset in range(days - 1, -1, -1):
+            count += rng.randint(-50, 500)
+            date = (today - timedelta(days=offset)).strftime('%Y%m%d')
+            fanslistday.append({'date': date, 'count': count})
+        return {'fanslistday': fanslistday}
+
+    def api_response(self, path, params):
+        """数据接口响应，返回 (状态码, 响应体)"""
+        time.sleep(self._delay(self.latency))
+        if path != SEARCH_API_PATH and self._should_fail():
+            self._count('errors')
+            return 500, {'status': 500, 'msg': 'mock server error'}
+
+        if path == SEARCH_API_PATH:
+            nickname = params.get('keyword', '')
+            users = [{Config.API_USER_ID_FIELD: user_id_for(nickname)}] if self.is_found(nickname) else []
+            return 200, {'status': 0, 'data': {'list': users}}
+
+        user_id = str(params.get(Config.API_USER_ID_PARAM) or params.get('user_id') or '')
+        if not user_id:
+            return 200, {'status': 0, 'data': None}
+        if path == TGI_API_PATH:
+            return 200, {'status': 0, 'data': self.tgi_data(user_id)}
+        return 200, {'status': 0, 'data': self.fans_data(user_id)}
+
+    def _handler_class(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status, body, content_type):
+                payload = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _handle(self, params):
+                path = urlparse(self.path).path
+                site._count(path)
+                if path in (TGI_API_PATH, FANS_API_PATH, SEARCH_API_PATH):
+                    status, body = site.api_response(path, params)
+                    self._send(status, json.dumps(body, ensure_ascii=False), 'application/json; charset=utf-8')
+                elif path == SEARCH_PATH:
+                    self._send(200, site.search_page(params.get('keyword', '')), 'text/html; charset=utf-8')
+                elif path == DETAIL_PATH:
+                    self._send(200, site.detail_page(params.get('user_id', '')), 'text/html; charset=utf-8')
+                else:
+                    self._send(200, '<!DOCTYPE html><html><body>巨量算数（模拟）</body></html>',
+                               'text/html; charset=utf-8')
+
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query)
+                self._handle({key: values[0] for key, values in query.items()})
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                try:
+                    params = json.loads(self.rfile.read(length) or b'{}')
+                except ValueError:
+                    params = {}
+                query = parse_qs(urlparse(self.path).query)
+                params.update({key: values[0] for key, values in query.items()})
+                self._handle(params)
+
+        return Handler
+
+
+if __name__ == "__main__":
+    # 单独启动模拟站点：python mock_site.py
+    logging.basicConfig(
+        level=Config.LOG_CONFIG['level'],
+        format=Config.LOG_CONFIG['format']
+    )
+    site = MockTrendSite(port=8000).start()
+    logging.info(f"搜索页示例: {site.url}{SEARCH_PATH}?keyword={quote('达人00001')}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        site.stop()
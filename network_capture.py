@@ -0,0 +1,223 @@
+# network_capture.py
+import json
+import time
+import logging
+from urllib.parse import urlparse
+from config import Config
+from metrics import metrics
+
+
+# 注入页面的拦截脚本：只记录目标接口的响应，页面内解析一次JSON
+INTERCEPTOR_SCRIPT = """
+(function (targets) {
+    if (window.__darenCapture) {
+        return;
+    }
+    window.__darenCapture = {};
+
+    function match(url) {
+        for (var i = 0; i < targets.length; i++) {
+            if (url && String(url).indexOf(targets[i]) !== -1) {
+                return targets[i];
+            }
+        }
+        return null;
+    }
+
+    function store(target, text) {
+        try {
+            window.__darenCapture[target] = JSON.parse(text);
+        } catch (e) {}
+    }
+
+    var originalFetch = window.fetch;
+    if (originalFetch) {
+        window.fetch = function () {
+            return originalFetch.apply(this, arguments).then(function (response) {
+                var target = match(response.url);
+                if (target) {
+                    response.clone().text().then(function (text) { store(target, text); });
+                }
+                return response;
+            });
+        };
+    }
+
+    var originalOpen = XMLHttpRequest.prototype.open;
+    XMLHttpRequest.prototype.open = function (method, url) {
+        this.__darenTarget = match(url);
+        return originalOpen.apply(this, arguments);
+    };
+
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        var xhr = this;
+        if (xhr.__darenTarget) {
+            xhr.addEventListener('load', function () {
+                if (xhr.responseType === 'json') {
+                    window.__darenCapture[xhr.__darenTarget] = xhr.response;
+                } else if (xhr.responseType === '' || xhr.responseType === 'text') {
+                    store(xhr.__darenTarget, xhr.responseText);
+                }
+            });
+        }
+        return originalSend.apply(this, arguments);
+    };
+})(%s);
+"""
+
+# 性能日志中需要处理的两类事件，先按子串过滤再解析JSON
+RESPONSE_RECEIVED = 'Network.responseReceived'
+LOADING_FINISHED = 'Network.loadingFinished'
+
+READ_CAPTURE_SCRIPT = """
+var capture = window.__darenCapture;
+return capture && capture[arguments[0]] ? capture[arguments[0]] : null;
+"""
+
+
+class NetworkCapture:
+    """只订阅目标接口的网络捕获组件，等待响应到达而不是固定休眠"""
+
+    def __init__(self, driver, target_urls, timeout=None, poll_interval=None):
+        """
+        Args:
+            driver: WebDriver实例
+            target_urls: 需要捕获的接口URL列表
+            timeout: 等待响应的超时时间，默认使用Config.STEP_TIMEOUTS['response']
+            poll_interval: 检查间隔，默认使用Config.WAIT_POLL_INTERVAL
+        """
+        self.driver = driver
+        self.targets = [urlparse(url).path for url in target_urls]
+        self.timeout = timeout or Config.STEP_TIMEOUTS['response']
+        self.poll_interval = poll_interval or Config.WAIT_POLL_INTERVAL
+        self.use_performance_log = True
+        self._pending = {}
+        self._responses = {}
+
+    def install(self):
+        """开启Network域并注入拦截脚本，对之后打开的每个页面生效"""
+        self.driver.execute_cdp_cmd('Network.enable', {})
+        self.driver.execute_cdp_cmd(
+            'Page.addScriptToEvaluateOnNewDocument',
+            {'source': INTERCEPTOR_SCRIPT % json.dumps(self.targets)})
+
+    def reset(self):
+        """丢弃之前捕获的响应和积压的性能日志，避免串到下一个昵称"""
+        if self.use_performance_log:
+            try:
+                self.driver.get_log('performance')
+            except Exception:
+                self.use_performance_log = False
+        self._pending.clear()
+        self._responses.clear()
+
+    def _match(self, url):
+        """返回URL命中的目标接口路径"""
+        for target in self.targets:
+            if target in url:
+                return target
+        return None
+
+    def _is_candidate(self, raw):
+        """
+        不解析JSON，只用子串判断日志是否可能需要处理：
+        包含目标接口路径的responseReceived，或已记录requestId的请求的loadingFinished
+        """
+        if RESPONSE_RECEIVED in raw:
+            return any(target in raw for target in self.targets)
+        if self._pending and LOADING_FINISHED in raw:
+            return any(f'"{request_id}"' in raw for request_id in self._pending)
+        return False
+
+    def scan(self, logs):
+        """处理一批性能日志，只有通过子串过滤的日志才解析JSON；目标请求加载完成后获取响应体"""
+        for entry in logs:
+            raw = entry.get('message', '')
+            if not self._is_candidate(raw):
+                continue
+            try:
+                message = json.loads(raw)['message']
+                method = message.get('method')
+                params = message.get('params', {})
+                if method == RESPONSE_RECEIVED:
+                    target = self._match(params['response']['url'])
+                    if target:
+                        self._pending[params['requestId']] = target
+                elif method == LOADING_FINISHED and params.get('requestId') in self._pending:
+                    self._fetch_body(params['requestId'])
+            except (KeyError, TypeError, ValueError):
+                continue
+
+    @metrics.timed('log_scan')
+    def _read_performance_log(self):
+        """读取并处理积压的性能日志"""
+        if not self.use_performance_log:
+            return
+        try:
+            logs = self.driver.get_log('performance')
+        except Exception as e:
+            logging.debug(f"性能日志不可用，仅使用页面拦截脚本: {str(e)}")
+            self.use_performance_log = False
+            return
+
+        if Config.PERFORMANCE_LOG_DUMP:
+            self._dump(logs)
+        self.scan(logs)
+
+    @staticmethod
+    def _dump(logs):
+        """把原始性能日志追加到记录文件（每行一条），供log_benchmark.py离线测试"""
+        try:
+            with open(Config.PERFORMANCE_LOG_DUMP, 'a', encoding='utf-8') as f:
+                for entry in logs:
+                    f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        except OSError as e:
+            logging.warning(f"记录性能日志失败: {str(e)}")
+
+    @metrics.timed('body_fetch')
+    def _fetch_body(self, request_id):
+        """获取已加载完成的目标请求的响应体"""
+        target = self._pending.pop(request_id)
+        try:
+            response = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+            self._responses[target] = json.loads(response['body'])
+        except Exception as e:
+            logging.error(f"获取接口响应体时出错: {str(e)}")
+
+    def _read_intercepted(self, target):
+        """读取页面拦截脚本记录的响应"""
+        try:
+            return self.driver.execute_script(READ_CAPTURE_SCRIPT, target)
+        except Exception as e:
+            logging.debug(f"读取页面拦截结果时出错: {str(e)}")
+            return None
+
+    def peek(self, target_url):
+        """不等待，取出目标接口已到达的响应，尚未到达时返回None"""
+        target = urlparse(target_url).path
+        response_data = self._read_intercepted(target)
+        if response_data is None:
+            self._read_performance_log()
+            response_data = self._responses.pop(target, None)
+        return response_data
+
+    def wait_for(self, target_url, timeout=None):
+        """
+        等待目标接口的响应
+        Args:
+            target_url: 接口URL
+            timeout: 超时时间（秒）
+        Returns:
+            解析后的响应JSON，超时返回None
+        """
+        deadline = time.monotonic() + (timeout or self.timeout)
+
+        while True:
+            response_data = self.peek(target_url)
+            if response_data is not None:
+                return response_data
+
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(self.poll_interval)
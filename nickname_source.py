@@ -0,0 +1,278 @@
+# nickname_source.py
+import os
+import csv
+import glob
+import logging
+import pandas as pd
+from hashlib import blake2b
+from config import Config
+from result_store import write_excel_atomic
+
+
+INPUT_EXTENSIONS = ('.xlsx', '.xlsm', '.xls', '.csv')
+
+
+def _nickname_key(nickname):
+    """昵称的64位摘要，去重集合只保存整数，不保存完整字符串"""
+    return int.from_bytes(blake2b(str(nickname).encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def _clean(value):
+    """空单元格返回None，其余保持原值，与结果表中读取到的昵称一致"""
+    if value is None:
+        return None
+    if isinstance(value, float) and value != value:  # NaN
+        return None
+    if isinstance(value, str) and not value.strip():
+        return None
+    return value
+
+
+def chunk_unique(values, chunk_size=None, seen=None):
+    """
+    增量去重并按块输出昵称
+    Args:
+        values: 昵称的可迭代对象
+        chunk_size: 每块的昵称数量，默认使用Config.INPUT_CHUNK_SIZE
+        seen: 已输出昵称的摘要集合，跨多个来源去重时传入同一个集合
+    """
+    chunk_size = chunk_size or Config.INPUT_CHUNK_SIZE
+    seen = set() if seen is None else seen
+    chunk = []
+    for value in values:
+        nickname = _clean(value)
+        if nickname is None:
+            continue
+        key = _nickname_key(nickname)
+        if key in seen:
+            continue
+        seen.add(key)
+        chunk.append(nickname)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class NicknameSource:
+    """流式读取xlsx/xls/csv中的昵称列，边读边去重，不把整张表载入内存"""
+
+    def __init__(self, path, sheet_name=None, column=None, chunk_size=None, seen=None):
+        """
+        Args:
+            path: 输入文件路径
+            sheet_name: 工作表名称，为None或不存在时使用第一个工作表
+            column: 昵称列名，默认使用Config.NICKNAME_COLUMN
+            chunk_size: 每块的昵称数量，默认使用Config.INPUT_CHUNK_SIZE
+            seen: 已输出昵称的摘要集合，多个来源共用时跨来源去重
+        """
+        self.path = path
+        self.sheet_name = sheet_name
+        self.column = column or Config.NICKNAME_COLUMN
+        self.chunk_size = chunk_size or Config.INPUT_CHUNK_SIZE
+        self.seen = set() if seen is None else seen
+
+    def _column_values(self, rows):
+        """从逐行读取的数据中取出昵称列，第一行为表头"""
+        rows = iter(rows)
+        header = next(rows, None)
+        if header is None:
+            return
+        header = [_clean(cell) for cell in header]
+        if self.column not in header:
+            raise ValueError(f"{self.path} 中找不到'{self.column}'列，可用的列名：{header}")
+        index = header.index(self.column)
+        for row in rows:
+            if index < len(row):
+                yield row[index]
+
+    def _read_xlsx(self):
+        """openpyxl只读模式逐行读取"""
+        from openpyxl import load_workbook
+        workbook = load_workbook(self.path, read_only=True, data_only=True)
+        try:
+            if self.sheet_name in workbook.sheetnames:
+                sheet = workbook[self.sheet_name]
+            else:
+                sheet = workbook.worksheets[0]
+            yield from self._column_values(sheet.iter_rows(values_only=True))
+        finally:
+            workbook.close()
+
+    def _read_xls(self):
+        """xlrd按需加载工作表，逐行读取"""
+        import xlrd
+        workbook = xlrd.open_workbook(self.path, on_demand=True)
+        try:
+            if self.sheet_name in workbook.sheet_names():
+                sheet = workbook.sheet_by_name(self.sheet_name)
+            else:
+                sheet = workbook.sheet_by_index(0)
+            rows = (sheet.row_values(i) for i in range(sheet.nrows))
+            yield from self._column_values(rows)
+        finally:
+            workbook.release_resources()
+
+    def _read_csv(self):
+        """csv逐行读取"""
+        with open(self.path, newline='', encoding='utf-8-sig') as f:
+            yield from self._column_values(csv.reader(f))
+
+    def values(self):
+        """按文件类型逐行读取昵称列（未去重）"""
+        extension = os.path.splitext(self.path)[1].lower()
+        if extension in ('.xlsx', '.xlsm'):
+            return self._read_xlsx()
+        if extension == '.xls':
+            return self._read_xls()
+        if extension == '.csv':
+            return self._read_csv()
+        raise ValueError(f"不支持的输入文件类型: {self.path}")
+
+    def chunks(self):
+        """按块输出去重后的昵称"""
+        total = 0
+        for chunk in chunk_unique(self.values(), self.chunk_size, self.seen):
+            total += len(chunk)
+            yield chunk
+        logging.info(f"已从 {self.path} 读取 {total} 个不重复昵称")
+
+
+def sheet_names(path):
+    """列出输入文件的工作表名称，csv返回[None]"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.xlsx', '.xlsm'):
+        from openpyxl import load_workbook
+        workbook = load_workbook(path, read_only=True)
+        try:
+            return list(workbook.sheetnames)
+        finally:
+            workbook.close()
+    if extension == '.xls':
+        import xlrd
+        workbook = xlrd.open_workbook(path, on_demand=True)
+        try:
+            return workbook.sheet_names()
+        finally:
+            workbook.release_resources()
+    return [None]
+
+
+class BatchSource:
+    """批量模式：把多个输入文件、多个工作表的昵称合并为一个去重后的采集列表，采集完成后把结果分发回各文件"""
+
+    def __init__(self, patterns=None, sheets=None, output_dir=None, chunk_size=None):
+        """
+        Args:
+            patterns: 输入目录或通配符（可为列表），默认使用Config.BATCH_INPUTS
+            sheets: 读取的工作表名称列表，默认使用Config.BATCH_INPUT_SHEETS，为None时读取所有工作表
+            output_dir: 结果目录，默认使用Config.BATCH_OUTPUT_DIR
+            chunk_size: 每块的昵称数量，默认使用Config.INPUT_CHUNK_SIZE
+        """
+        patterns = patterns or Config.BATCH_INPUTS
+        self.patterns = [patterns] if isinstance(patterns, str) else list(patterns)
+        self.sheets = Config.BATCH_INPUT_SHEETS if sheets is None else sheets
+        self.output_dir = output_dir or Config.BATCH_OUTPUT_DIR
+        self.chunk_size = chunk_size or Config.INPUT_CHUNK_SIZE
+        self.seen = set()
+        self.sources = {}  # {文件路径: [包含昵称列的工作表]}
+
+    def files(self):
+        """展开目录和通配符，返回去重排序后的输入文件列表（跳过Excel临时文件和结果目录）"""
+        output_dir = os.path.abspath(self.output_dir)
+        paths = set()
+        for pattern in self.patterns:
+            if os.path.isdir(pattern):
+                pattern = os.path.join(pattern, '*')
+            for path in glob.glob(pattern):
+                name = os.path.basename(path)
+                if (os.path.isfile(path) and not name.startswith('~$')
+                        and os.path.splitext(name)[1].lower() in INPUT_EXTENSIONS
+                        and os.path.dirname(os.path.abspath(path)) != output_dir):
+                    paths.add(os.path.normpath(path))
+        return sorted(paths)
+
+    def chunks(self):
+        """依次读取所有文件的工作表，跨文件去重后按块输出昵称"""
+        files = self.files()
+        if not files:
+            logging.error(f"批量模式没有找到输入文件: {self.patterns}")
+            return
+        logging.info(f"批量模式共 {len(files)} 个输入文件")
+
+        for path in files:
+            try:
+                names = sheet_names(path)
+            except Exception as e:
+                logging.error(f"读取 {path} 失败，已跳过: {str(e)}")
+                continue
+            for sheet_name in names:
+                if self.sheets and sheet_name is not None and sheet_name not in self.sheets:
+                    continue
+                source = NicknameSource(path, sheet_name, chunk_size=self.chunk_size, seen=self.seen)
+                try:
+                    yield from source.chunks()
+                except ValueError as e:
+                    logging.warning(f"{path} 的工作表 {sheet_name} 已跳过: {str(e)}")
+                    continue
+                self.sources.setdefault(path, []).append(sheet_name)
+        logging.info(f"批量模式共读取 {len(self.seen)} 个不重复昵称")
+
+    def _output_path(self, path, used):
+        """输入文件对应的结果文件路径，同名文件依次加序号"""
+        stem = os.path.splitext(os.path.basename(path))[0]
+        output = os.path.join(self.output_dir, f"{stem}.xlsx")
+        index = 1
+        while output in used:
+            index += 1
+            output = os.path.join(self.output_dir, f"{stem}_{index}.xlsx")
+        used.add(output)
+        return output
+
+    @staticmethod
+    def _read_sheet(path, sheet_name):
+        """完整读取一个工作表（输入列表通常不大，结果分发时一次读入）"""
+        if sheet_name is None:
+            return pd.read_csv(path, encoding='utf-8-sig')
+        return pd.read_excel(path, sheet_name=sheet_name)
+
+    def write_results(self, result_frames):
+        """
+        把采集结果按昵称合并回每个输入文件的各工作表，每个文件只写一次
+        Args:
+            result_frames: 各提取器的结果表（含昵称列的DataFrame列表）
+        """
+        column = Config.NICKNAME_COLUMN
+        results = None
+        for frame in result_frames:
+            if frame is None or column not in frame.columns:
+                continue
+            frame = frame.dropna(subset=[column]).drop_duplicates(subset=[column], keep='last')
+            if results is None:
+                results = frame
+            else:
+                extra = [c for c in frame.columns if c == column or c not in results.columns]
+                results = results.merge(frame[extra], on=column, how='outer')
+        if results is None:
+            logging.warning("没有可分发的采集结果")
+            return []
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        written, used = [], set()
+        for path, names in self.sources.items():
+            output = self._output_path(path, used)
+            try:
+                sheets = {}
+                for sheet_name in names:
+                    df = self._read_sheet(path, sheet_name)
+                    # 采集结果覆盖输入表中的同名列
+                    overlap = [c for c in results.columns if c != column and c in df.columns]
+                    merged = df.drop(columns=overlap).merge(results, on=column, how='left')
+                    sheets[sheet_name or Config.SHEET_NAME] = merged
+                write_excel_atomic(sheets, output)
+                written.append(output)
+                logging.info(f"已把 {path} 的采集结果写入 {output}（{len(sheets)} 个工作表）")
+            except Exception as e:
+                logging.error(f"写入 {output} 失败: {str(e)}")
+        return written
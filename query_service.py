@@ -0,0 +1,355 @@
+# query_service.py
+import os
+import json
+import time
+import bisect
+import heapq
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from config import Config
+
+
+def connect_readonly(db_path):
+    """以只读方式打开SQLite存储，不会锁住采集器正在写入的数据库；文件不存在时返回None"""
+    if not os.path.exists(db_path):
+        return None
+    return sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False)
+
+
+class MetricsIndex:
+    """
+    采集结果的内存索引：TGI按昵称建字典并维护按均值排序的数组，粉丝数据按昵称保存按日期排序的数组。
+    数据来自TGI/粉丝数据的SQLite存储，采集器写入后按updated_at增量刷新，不读取Excel文件
+    """
+
+    def __init__(self, tgi_db=None, fans_db=None):
+        """
+        Args:
+            tgi_db: TGI存储路径，默认使用Config.TGI_DB
+            fans_db: 粉丝数据存储路径，默认使用Config.FANS_DB
+        """
+        self.tgi_db = tgi_db or Config.TGI_DB
+        self.fans_db = fans_db or Config.FANS_DB
+        self._lock = threading.RLock()
+        self._connections = {}
+        self._versions = {}
+        self._watermarks = {'tgi': 0.0, 'fans': 0.0}
+
+        self.tgi = {}            # {昵称: {城市等级: TGI}}
+        self.tgi_mean = {}       # {昵称: TGI均值}
+        self._ranking = None     # 按TGI均值升序的 (均值列表, 昵称列表)，数据变化后重建
+        self.fans = {}           # {昵称: (日期列表, 粉丝数列表)}，日期升序
+        self._fans_ranking = None  # 按最新粉丝数降序的 [(粉丝数, 昵称)]，数据变化后重建
+        self.loaded_at = None
+
+    def _connection(self, name, db_path):
+        """按需打开只读连接，数据库文件出现前返回None"""
+        conn = self._connections.get(name)
+        if conn is None:
+            conn = connect_readonly(db_path)
+            if conn is not None:
+                self._connections[name] = conn
+        return conn
+
+    def _changed(self, name, conn):
+        """其他连接（采集器）提交新数据后data_version会变化"""
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if self._versions.get(name) == version:
+            return False
+        self._versions[name] = version
+        return True
+
+    def _reload_tgi(self, conn):
+        """
+        读取上次刷新后更新过的达人的完整TGI向量（存储按达人整体替换）；
+        只有导入的历史均值、还没有完整向量的达人只提供均值
+        """
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        means = []
+        if 'tgi_mean' in tables:
+            means = conn.execute(
+                "SELECT nickname, value, updated_at FROM tgi_mean WHERE updated_at >= ?",
+                (self._watermarks['tgi'],)).fetchall()
+        rows = conn.execute(
+            "SELECT nickname, tier, value, updated_at FROM tgi_city WHERE updated_at >= ?",
+            (self._watermarks['tgi'],)).fetchall()
+        vectors = {}
+        for nickname, tier, value, updated_at in rows:
+            vectors.setdefault(nickname, {})[tier] = value
+            self._watermarks['tgi'] = max(self._watermarks['tgi'], updated_at)
+
+        with self._lock:
+            imported = 0
+            for nickname, value, updated_at in means:
+                self._watermarks['tgi'] = max(self._watermarks['tgi'], updated_at)
+                if nickname in vectors or self.tgi.get(nickname):
+                    continue
+                self.tgi[nickname] = {}
+                self.tgi_mean[nickname] = value
+                imported += 1
+            for nickname, vector in vectors.items():
+                self.tgi[nickname] = vector
+                self.tgi_mean[nickname] = sum(vector.values()) / len(vector)
+            if vectors or imported:
+                self._ranking = None
+        return len(vectors) + imported
+
+    def _reload_fans(self, conn):
+        """重新读取上次刷新后有新数据的达人的完整粉丝序列"""
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(fans_daily)")]
+        if 'updated_at' in columns:
+            rows = conn.execute(
+                "SELECT nickname, date, count, updated_at FROM fans_daily WHERE nickname IN "
+                "(SELECT DISTINCT nickname FROM fans_daily WHERE updated_at >= ?) ORDER BY nickname, date",
+                (self._watermarks['fans'],)).fetchall()
+        else:
+            # 旧版本存储没有updated_at列（采集器下次运行时自动添加），先全量读取
+            rows = conn.execute(
+                "SELECT nickname, date, count, 0 FROM fans_daily ORDER BY nickname, date").fetchall()
+        series = {}
+        for nickname, date, count, updated_at in rows:
+            dates, counts = series.setdefault(nickname, ([], []))
+            dates.append(date)
+            counts.append(count)
+            self._watermarks['fans'] = max(self._watermarks['fans'], updated_at)
+
+        with self._lock:
+            self.fans.update(series)
+            if series:
+                self._fans_ranking = None
+        return len(series)
+
+    def refresh(self):
+        """检查两个存储是否有新提交，有则增量刷新索引，返回 {数据类型: 刷新的达人数}"""
+        refreshed = {}
+        for name, db_path, reload in (('tgi', self.tgi_db, self._reload_tgi),
+                                      ('fans', self.fans_db, self._reload_fans)):
+            try:
+                conn = self._connection(name, db_path)
+                if conn is not None and self._changed(name, conn):
+                    refreshed[name] = reload(conn)
+            except sqlite3.Error as e:
+                # 表还没创建或正在迁移，下次再试
+                logging.warning(f"刷新{name}索引失败: {str(e)}")
+                self._versions.pop(name, None)
+        if refreshed:
+            self.loaded_at = time.time()
+            logging.info(f"查询索引已刷新: {refreshed}")
+        return refreshed
+
+    def close(self):
+        """关闭只读连接"""
+        for conn in self._connections.values():
+            conn.close()
+        self._connections.clear()
+
+    def _tgi_ranking(self):
+        """按TGI均值升序排列的数组，供Top-N和范围查询使用"""
+        with self._lock:
+            if self._ranking is None:
+                ordered = sorted((mean, nickname) for nickname, mean in self.tgi_mean.items())
+                self._ranking = ([mean for mean, _ in ordered], [nickname for _, nickname in ordered])
+            return self._ranking
+
+    def _tgi_item(self, nickname):
+        return {'nickname': nickname, 'tgi_mean': self.tgi_mean[nickname], 'tiers': self.tgi[nickname]}
+
+    def lookup(self, nickname):
+        """查询一个达人的TGI和最新粉丝数，没有数据时返回None"""
+        with self._lock:
+            tgi = self.tgi.get(nickname)
+            fans = self.fans.get(nickname)
+        if tgi is None and fans is None:
+            return None
+        result = {'nickname': nickname}
+        if tgi is not None:
+            result.update(self._tgi_item(nickname))
+        if fans is not None:
+            dates, counts = fans
+            result['fans_latest'] = {'date': dates[-1], 'count': counts[-1]}
+        return result
+
+    def tgi_top(self, n, tier=None):
+        """TGI均值（或指定城市等级的TGI）最高的n个达人"""
+        if tier:
+            with self._lock:
+                candidates = [(vector[tier], nickname) for nickname, vector in self.tgi.items() if tier in vector]
+            return [self._tgi_item(nickname) for _, nickname in heapq.nlargest(n, candidates)]
+        means, nicknames = self._tgi_ranking()
+        return [self._tgi_item(nickname) for nickname in reversed(nicknames[-n:])] if n else []
+
+    def tgi_range(self, low=None, high=None, limit=None):
+        """TGI均值在 [low, high] 之间的达人，按均值降序"""
+        means, nicknames = self._tgi_ranking()
+        start = 0 if low is None else bisect.bisect_left(means, low)
+        end = len(means) if high is None else bisect.bisect_right(means, high)
+        selected = nicknames[start:end][::-1]
+        return [self._tgi_item(nickname) for nickname in selected[:limit]]
+
+    def fans_series(self, nickname, start=None, end=None):
+        """一个达人在 [start, end] 日期范围内的粉丝数序列，日期格式同存储（如20241212）"""
+        with self._lock:
+            series = self.fans.get(nickname)
+        if series is None:
+            return None
+        dates, counts = series
+        left = 0 if start is None else bisect.bisect_left(dates, start)
+        right = len(dates) if end is None else bisect.bisect_right(dates, end)
+        return [{'date': date, 'count': count} for date, count in zip(dates[left:right], counts[left:right])]
+
+    def fans_top(self, n, start=None, end=None):
+        """最新粉丝数最高的n个达人；指定日期范围时按范围内的粉丝增长排序"""
+        with self._lock:
+            if start is None and end is None:
+                if self._fans_ranking is None:
+                    self._fans_ranking = sorted(
+                        ((counts[-1], nickname) for nickname, (_, counts) in self.fans.items()), reverse=True)
+                return [{'nickname': nickname, 'date': self.fans[nickname][0][-1], 'count': count}
+                        for count, nickname in self._fans_ranking[:n]]
+            items = list(self.fans.items())
+
+        ranked = []
+        for nickname, (dates, counts) in items:
+            left = 0 if start is None else bisect.bisect_left(dates, start)
+            right = len(dates) if end is None else bisect.bisect_right(dates, end)
+            if right - left < 2:
+                continue
+            growth = counts[right - 1] - counts[left]
+            ranked.append((growth, nickname, {
+                'from': dates[left], 'to': dates[right - 1], 'growth': growth, 'count': counts[right - 1]}))
+        return [dict(nickname=nickname, **detail) for _, nickname, detail in heapq.nlargest(n, ranked)]
+
+    def status(self):
+        """索引规模和最后刷新时间"""
+        with self._lock:
+            return {'tgi_creators': len(self.tgi), 'fans_creators': len(self.fans), 'loaded_at': self.loaded_at}
+
+
+class QueryServer:
+    """只读HTTP查询服务：后台定期增量刷新索引，查询只读内存，不接触采集器的工作文件"""
+
+    def __init__(self, index=None, host=None, port=None, reload_interval=None):
+        """
+        Args:
+            index: MetricsIndex，默认读取Config中的存储路径
+            host: 监听地址，默认使用Config.QUERY_HOST
+            port: 监听端口，默认使用Config.QUERY_PORT，0表示随机分配
+            reload_interval: 检查新数据的间隔(秒)，默认使用Config.QUERY_RELOAD_INTERVAL
+        """
+        self.index = index or MetricsIndex()
+        self.reload_interval = reload_interval or Config.QUERY_RELOAD_INTERVAL
+        self.server = ThreadingHTTPServer(
+            (host or Config.QUERY_HOST, Config.QUERY_PORT if port is None else port), self._handler_class())
+        self.server.daemon_threads = True
+        self._stop = threading.Event()
+        self._threads = []
+
+    @property
+    def url(self):
+        """服务根地址，如 http://127.0.0.1:8765"""
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _reload_loop(self):
+        while not self._stop.wait(self.reload_interval):
+            self.index.refresh()
+
+    def start(self):
+        """加载索引并在后台线程中启动服务"""
+        self.index.refresh()
+        self._threads = [
+            threading.Thread(target=self._reload_loop, daemon=True),
+            threading.Thread(target=self.server.serve_forever, daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        logging.info(f"查询服务已启动: {self.url}")
+        return self
+
+    def stop(self):
+        """停止服务"""
+        self._stop.set()
+        self.server.shutdown()
+        self.server.server_close()
+        self.index.close()
+        logging.info("查询服务已停止")
+
+    def handle(self, path, params):
+        """处理一次查询，返回 (状态码, 响应JSON)"""
+        index = self.index
+
+        def param(name, default=None):
+            return params.get(name, [default])[0]
+
+        def number(name, default=None, cast=float):
+            value = param(name)
+            return default if value in (None, '') else cast(value)
+
+        def count(name, default):
+            value = number(name, default, int)
+            if value < 0:
+                raise ValueError(f"{name}不能为负数")
+            return min(value, Config.QUERY_MAX_LIMIT)
+
+        limit = count('n', 10)
+        if path == '/status':
+            return 200, index.status()
+        if path == '/creator':
+            result = index.lookup(param('nickname', ''))
+            return (200, result) if result else (404, {'error': '没有该达人的数据'})
+        if path == '/tgi/top':
+            return 200, index.tgi_top(limit, param('tier'))
+        if path == '/tgi/range':
+            limit = count('limit', Config.QUERY_MAX_LIMIT)
+            return 200, index.tgi_range(number('min'), number('max'), limit)
+        if path == '/fans/series':
+            result = index.fans_series(param('nickname', ''), param('start'), param('end'))
+            return (200, result) if result is not None else (404, {'error': '没有该达人的粉丝数据'})
+        if path == '/fans/top':
+            return 200, index.fans_top(limit, param('start'), param('end'))
+        return 404, {'error': f"未知的查询: {path}",
+                     'queries': ['/status', '/creator', '/tgi/top', '/tgi/range', '/fans/series', '/fans/top']}
+
+    def _handler_class(self):
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                try:
+                    status, body = service.handle(parsed.path.rstrip('/') or '/', parse_qs(parsed.query))
+                except ValueError as e:
+                    status, body = 400, {'error': f"参数错误: {str(e)}"}
+                except Exception as e:
+                    logging.error(f"处理查询 {self.path} 时出错: {str(e)}")
+                    status, body = 500, {'error': str(e)}
+
+                payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+
+if __name__ == "__main__":
+    # 启动只读查询服务：python query_service.py
+    logging.basicConfig(
+        level=Config.LOG_CONFIG['level'],
+        format=Config.LOG_CONFIG['format']
+    )
+    service = QueryServer().start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        service.stop()
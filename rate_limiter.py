@@ -0,0 +1,76 @@
+# rate_limiter.py
+import time
+import asyncio
+import logging
+from config import Config
+
+
+class TokenBucket:
+    """令牌桶限速器：按固定速率补充令牌，每次请求消耗一个令牌"""
+
+    def __init__(self, rate, capacity):
+        """
+        Args:
+            rate: 每秒补充的令牌数（即每秒请求数）
+            capacity: 桶容量，允许的最大突发请求数
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        """按经过的时间补充令牌"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """获取一个令牌，令牌不足时等待"""
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AdaptiveRateLimiter(TokenBucket):
+    """自适应限速器：连续失败时按比例降低速率，成功后逐步恢复（AIMD）"""
+
+    def __init__(self, rate=None, capacity=None, min_rate=None, max_rate=None):
+        super().__init__(rate or Config.RATE_LIMIT, capacity or Config.RATE_BURST)
+        self.min_rate = min_rate or Config.RATE_LIMIT_MIN
+        self.max_rate = max_rate or Config.RATE_LIMIT_MAX
+        self.consecutive_failures = 0
+
+    def _set_rate(self, rate):
+        """先按旧速率结算令牌，再切换到新速率"""
+        self._refill()
+        self.rate = max(self.min_rate, min(self.max_rate, rate))
+
+    def on_success(self):
+        """请求成功：线性提高速率"""
+        self.consecutive_failures = 0
+        self._set_rate(self.rate + Config.RATE_INCREASE_STEP)
+
+    def on_failure(self):
+        """请求失败或结果为空：连续失败达到阈值后按比例降低速率"""
+        # 单个昵称搜不到结果很常见，只有连续失败才说明可能被限流
+        self.consecutive_failures += 1
+        if self.consecutive_failures < Config.RATE_FAILURE_THRESHOLD:
+            return
+
+        old_rate = self.rate
+        self._set_rate(self.rate * Config.RATE_DECREASE_FACTOR)
+        if self.rate < old_rate:
+            logging.info(f"请求失败，速率由 {old_rate:.2f}/秒 降至 {self.rate:.2f}/秒")
+
+    def record(self, success):
+        """根据请求结果调整速率"""
+        if success:
+            self.on_success()
+        else:
+            self.on_failure()
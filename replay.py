@@ -0,0 +1,68 @@
+# replay.py
+import sys
+import time
+import logging
+from config import Config
+from response_archive import ResponseArchive
+from extractors import TgiExtractor, FansExtractor
+
+
+EXTRACTORS = {
+    'tgi': TgiExtractor,
+    'fans': FansExtractor,
+}
+
+
+def replay(extractors, archive=None, since=None):
+    """
+    不打开浏览器，用归档的接口响应重新运行提取器并写回结果文件
+    Args:
+        extractors: 提取器列表
+        archive: 响应归档，默认打开Config.ARCHIVE_DB
+        since: 只重放该时间戳之后归档的响应（可选）
+    Returns:
+        {数据类型: 成功处理的响应数}
+    """
+    own_archive = archive is None
+    archive = archive or ResponseArchive()
+    counts = {}
+    try:
+        for extractor in extractors:
+            start = time.perf_counter()
+            df = extractor.result_store.load()
+            extractor.on_load(df)
+            # 重放时只在结束时写回一次Excel；按归档内容覆盖已有数据，包括早于已存最新日期的历史数据
+            extractor.result_store.flush_rows = 0
+            extractor.result_store.flush_interval = 0
+            extractor.incremental = False
+
+            processed = succeeded = 0
+            try:
+                for nickname, _, response_data in archive.iter_responses(
+                        extractor.api_url, latest_only=not extractor.replay_history, since=since):
+                    processed += 1
+                    if extractor.process(nickname, response_data, verbose=False):
+                        succeeded += 1
+            finally:
+                extractor.close()
+
+            counts[extractor.name] = succeeded
+            logging.info(f"{extractor.label}重放完成：{succeeded}/{processed} 条响应处理成功，"
+                         f"耗时 {time.perf_counter() - start:.1f}秒")
+    finally:
+        if own_archive:
+            archive.close()
+    return counts
+
+
+if __name__ == "__main__":
+    # 从归档重新提取：python replay.py [tgi] [fans]，不指定时全部重放
+    logging.basicConfig(
+        level=Config.LOG_CONFIG['level'],
+        format=Config.LOG_CONFIG['format']
+    )
+    names = sys.argv[1:] or list(EXTRACTORS)
+    unknown = [name for name in names if name not in EXTRACTORS]
+    if unknown:
+        sys.exit(f"未知的数据类型: {unknown}，可选 {list(EXTRACTORS)}")
+    replay([EXTRACTORS[name]() for name in names])
@@ -0,0 +1,97 @@
+# response_archive.py
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+from urllib.parse import urlparse
+from config import Config
+
+
+class ResponseArchive:
+    """
+    接口原始响应的本地归档：响应体按内容哈希去重、zlib压缩存储，
+    按 昵称+接口+时间 建立索引，可在不打开浏览器的情况下重新提取数据
+    """
+
+    def __init__(self, db_path=None):
+        """
+        Args:
+            db_path: SQLite文件路径，默认使用Config.ARCHIVE_DB
+        """
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path or Config.ARCHIVE_DB, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS blobs (
+                digest TEXT PRIMARY KEY,
+                body BLOB NOT NULL
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS responses (
+                id INTEGER PRIMARY KEY,
+                nickname TEXT NOT NULL,
+                endpoint TEXT NOT NULL,
+                captured_at REAL NOT NULL,
+                digest TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_responses_lookup
+                ON responses (endpoint, nickname, captured_at);
+        """)
+        self.conn.commit()
+
+    @staticmethod
+    def endpoint_of(url):
+        """接口URL对应的归档键（URL路径）"""
+        return urlparse(url).path
+
+    def put(self, nickname, url, response_data):
+        """归档一次接口响应，返回内容哈希"""
+        body = json.dumps(response_data, ensure_ascii=False, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        digest = hashlib.sha256(body).hexdigest()
+        with self._lock:
+            exists = self.conn.execute("SELECT 1 FROM blobs WHERE digest = ?", (digest,)).fetchone()
+            if not exists:
+                self.conn.execute(
+                    "INSERT INTO blobs (digest, body) VALUES (?, ?)", (digest, zlib.compress(body, 6)))
+            self.conn.execute(
+                "INSERT INTO responses (nickname, endpoint, captured_at, digest) VALUES (?, ?, ?, ?)",
+                (nickname, self.endpoint_of(url), time.time(), digest))
+            self.conn.commit()
+        return digest
+
+    def iter_responses(self, url, latest_only=True, since=None):
+        """
+        按采集时间顺序读取某个接口的归档响应
+        Args:
+            url: 接口URL
+            latest_only: 每个昵称只返回最新的一次响应
+            since: 只返回该时间戳之后采集的响应（可选）
+        Yields:
+            (昵称, 采集时间, 响应JSON)
+        """
+        endpoint = self.endpoint_of(url)
+        if latest_only:
+            query = ("SELECT r.nickname, r.captured_at, b.body FROM responses r "
+                     "JOIN (SELECT nickname, MAX(captured_at) AS latest FROM responses "
+                     "WHERE endpoint = ? AND captured_at >= ? GROUP BY nickname) l "
+                     "ON r.nickname = l.nickname AND r.captured_at = l.latest "
+                     "JOIN blobs b ON b.digest = r.digest "
+                     "WHERE r.endpoint = ? ORDER BY r.captured_at")
+            params = (endpoint, since or 0, endpoint)
+        else:
+            query = ("SELECT r.nickname, r.captured_at, b.body FROM responses r "
+                     "JOIN blobs b ON b.digest = r.digest "
+                     "WHERE r.endpoint = ? AND r.captured_at >= ? ORDER BY r.captured_at")
+            params = (endpoint, since or 0)
+
+        with self._lock:
+            rows = self.conn.execute(query, params).fetchall()
+        for nickname, captured_at, body in rows:
+            yield nickname, captured_at, json.loads(zlib.decompress(body))
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,207 @@
+# result_store.py
+import os
+import time
+import shutil
+import logging
+import tempfile
+import threading
+import pandas as pd
+from config import Config
+from metrics import metrics
+
+
+@metrics.timed('excel_write')
+def write_excel_atomic(df, excel_file, sheet_name=None):
+    """
+    先写同目录下的临时文件再原子替换，写入中途崩溃不会损坏原文件
+    Args:
+        df: DataFrame，或 {工作表名称: DataFrame}（一次写入多个工作表）
+        excel_file: Excel文件路径
+        sheet_name: df为DataFrame时的工作表名称
+    """
+    directory = os.path.dirname(os.path.abspath(excel_file))
+    fd, tmp_path = tempfile.mkstemp(
+        prefix='.tmp_', suffix=os.path.splitext(excel_file)[1] or '.xlsx', dir=directory)
+    os.close(fd)
+
+    try:
+        if isinstance(df, dict):
+            with pd.ExcelWriter(tmp_path) as writer:
+                for name, frame in df.items():
+                    frame.to_excel(writer, index=False, sheet_name=name)
+        else:
+            df.to_excel(tmp_path, index=False, sheet_name=sheet_name or Config.SHEET_NAME)
+        # mkstemp创建的文件只有所有者可读写，替换前恢复原文件（或默认）的权限
+        if os.path.exists(excel_file):
+            shutil.copymode(excel_file, tmp_path)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, excel_file)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class ExcelResultStore:
+    """在内存中维护结果表，按行数/时间策略批量写回Excel文件"""
+
+    def __init__(self, excel_file, sheet_name=None, flush_rows=None,
+                 flush_interval=None, column_sorter=None):
+        """
+        Args:
+            excel_file: 结果Excel文件路径
+            sheet_name: 工作表名称，默认使用Config.SHEET_NAME
+            flush_rows: 累计更新多少个昵称后写回，默认使用Config.FLUSH_ROWS
+            flush_interval: 距上次写回超过多少秒后写回，默认使用Config.FLUSH_INTERVAL
+            column_sorter: 写回前对DataFrame列重新排序的函数（可选）
+        """
+        self.excel_file = excel_file
+        self.sheet_name = sheet_name or Config.SHEET_NAME
+        self.flush_rows = Config.FLUSH_ROWS if flush_rows is None else flush_rows
+        self.flush_interval = Config.FLUSH_INTERVAL if flush_interval is None else flush_interval
+        self.column_sorter = column_sorter
+
+        self.df = None
+        self._row_index = {}
+        self._pending = 0
+        self._appended = 0
+        self._transient = set()
+        self._last_flush = time.monotonic()
+        self._lock = threading.RLock()
+
+    def load(self):
+        """读取Excel文件到内存并建立昵称索引"""
+        with self._lock:
+            self.df = pd.read_excel(self.excel_file, sheet_name=self.sheet_name)
+            self._build_index()
+            self._pending = 0
+            self._appended = 0
+            self._transient = set()
+            self._last_flush = time.monotonic()
+            return self.df
+
+    def _build_index(self):
+        """建立 昵称 -> 行索引 的映射，避免每次更新都全表扫描"""
+        self._row_index = {}
+        if Config.NICKNAME_COLUMN not in self.df.columns:
+            return
+        for idx, nickname in self.df[Config.NICKNAME_COLUMN].items():
+            self._row_index.setdefault(nickname, []).append(idx)
+
+    def has_nickname(self, nickname):
+        """检查结果表中是否存在该昵称"""
+        return nickname in self._row_index
+
+    def is_transient(self, nickname):
+        """该昵称是否为批量模式追加的临时昵称（不写回Excel）"""
+        return nickname in self._transient
+
+    def get_row(self, nickname):
+        """返回该昵称所在的第一行数据，不存在时返回None"""
+        with self._lock:
+            rows = self._row_index.get(nickname)
+            if self.df is None or not rows:
+                return None
+            return self.df.loc[rows[0]]
+
+    def add_nicknames(self, nicknames, transient=False):
+        """
+        把结果表中还没有的昵称追加为新行，返回追加的数量。
+        追加的行不计入待写回的更新数，随下一次正常写回（或关闭时）保存，避免每块昵称都重写整个文件
+        Args:
+            nicknames: 昵称列表
+            transient: 为True时新行只保留在内存中参与采集，写回Excel时排除（批量模式不改动主结果表）
+        """
+        with self._lock:
+            if self.df is None:
+                self.load()
+
+            new_nicknames = [nickname for nickname in nicknames if nickname not in self._row_index]
+            if not new_nicknames:
+                return 0
+
+            start = int(self.df.index.max()) + 1 if len(self.df) else 0
+            rows = pd.DataFrame(
+                {Config.NICKNAME_COLUMN: new_nicknames}, index=range(start, start + len(new_nicknames)))
+            self.df = pd.concat([self.df, rows])
+            for idx, nickname in rows[Config.NICKNAME_COLUMN].items():
+                self._row_index[nickname] = [idx]
+
+            if transient:
+                self._transient.update(new_nicknames)
+            else:
+                self._appended += len(new_nicknames)
+            return len(new_nicknames)
+
+    def update(self, nickname, values, dtype=None):
+        """
+        在内存中更新指定昵称所在行
+        Args:
+            nickname: 达人昵称
+            values: {列名: 值} 字典
+            dtype: 新建列时使用的数据类型（可选）
+        Returns:
+            是否找到并更新了该昵称
+        """
+        with self._lock:
+            if self.df is None:
+                self.load()
+
+            rows = self._row_index.get(nickname)
+            if not rows:
+                return False
+
+            new_columns = [col for col in values if col not in self.df.columns]
+            if new_columns:
+                # 一次性添加所有新列，避免DataFrame碎片化
+                empty = pd.DataFrame(
+                    {col: pd.Series(index=self.df.index, dtype=dtype or 'object') for col in new_columns})
+                self.df = pd.concat([self.df, empty], axis=1)
+
+            for col, value in values.items():
+                self.df.loc[rows, col] = value
+
+            if nickname not in self._transient:
+                self._pending += 1
+                self._maybe_flush()
+            return True
+
+    def _maybe_flush(self):
+        """满足行数或时间条件时写回"""
+        if self.flush_rows and self._pending >= self.flush_rows:
+            self.flush()
+        elif self.flush_interval and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """将内存中的数据写回Excel（先写临时文件再原子替换）"""
+        with self._lock:
+            if self.df is None or (self._pending == 0 and self._appended == 0):
+                return False
+
+            df = self.df
+            if self._transient:
+                df = df[~df[Config.NICKNAME_COLUMN].isin(self._transient)]
+            df = self.column_sorter(df) if self.column_sorter else df
+            try:
+                start = time.monotonic()
+                write_excel_atomic(df, self.excel_file, self.sheet_name)
+                appended = f"和 {self._appended} 个新昵称" if self._appended else ''
+                logging.info(
+                    f"已将 {self._pending} 条更新{appended}写回 {self.excel_file}，"
+                    f"耗时 {time.monotonic() - start:.2f}秒")
+                self._pending = 0
+                self._appended = 0
+                self._last_flush = time.monotonic()
+                return True
+            except Exception as e:
+                logging.error(f"写回Excel文件 {self.excel_file} 时出错: {str(e)}")
+                # 保留未写回的更新，等下一个周期重试
+                self._last_flush = time.monotonic()
+                return False
+
+    def close(self):
+        """关闭前写回所有未保存的更新"""
+        self.flush()
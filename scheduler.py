@@ -0,0 +1,86 @@
+# scheduler.py
+import time
+import heapq
+import logging
+import pandas as pd
+from config import Config
+
+
+class RefreshScheduler:
+    """按 陈旧度×优先级 排序的采集调度：只采集到期的达人，并受每次运行的数量/时间预算限制"""
+
+    def __init__(self, extractors, max_creators=None, max_minutes=None):
+        """
+        Args:
+            extractors: 提取器列表，从其结果表读取优先级和刷新间隔，从断点记录读取上次成功时间
+            max_creators: 本次最多采集的达人数，默认使用Config.RUN_MAX_CREATORS
+            max_minutes: 本次运行的时间预算(分钟)，默认使用Config.RUN_MAX_MINUTES
+        """
+        self.extractors = extractors
+        self.max_creators = max_creators if max_creators is not None else Config.RUN_MAX_CREATORS
+        self.max_minutes = max_minutes if max_minutes is not None else Config.RUN_MAX_MINUTES
+        self._heap = []
+        self._last_success = {}
+
+    def _setting(self, nickname, column, default):
+        """从各提取器的结果表中读取该达人的设置，未填写时返回默认值"""
+        for extractor in self.extractors:
+            row = extractor.result_store.get_row(nickname)
+            if row is None or column not in row.index or pd.isna(row[column]):
+                continue
+            try:
+                return float(row[column])
+            except (TypeError, ValueError):
+                logging.warning(f"{nickname} 的'{column}'不是数字: {row[column]}")
+        return default
+
+    def _stale_seconds(self, nickname):
+        """距各提取器中最早的一次成功采集已过去的秒数，有提取器从未成功时返回None"""
+        last_times = [self._last_success[extractor.name].get(nickname) for extractor in self.extractors]
+        if any(last is None for last in last_times):
+            return None
+        return time.time() - min(last_times)
+
+    def build(self, nicknames):
+        """计算每个达人的得分并建立优先队列，返回到期的达人数"""
+        self._last_success = {
+            extractor.name: extractor.checkpoint.last_success_all() for extractor in self.extractors
+        }
+        self._heap = []
+        not_due = 0
+        for order, nickname in enumerate(nicknames):
+            priority = self._setting(nickname, Config.PRIORITY_COLUMN, Config.DEFAULT_PRIORITY)
+            interval = self._setting(nickname, Config.REFRESH_INTERVAL_COLUMN, Config.DEFAULT_REFRESH_HOURS) * 3600
+
+            stale = self._stale_seconds(nickname)
+            if stale is None:
+                # 从未采集过的达人单独分为最前的一组，组内按优先级排序
+                # （不用无穷大的陈旧度参与乘法，优先级为0时会得到NaN，破坏堆的顺序）
+                key = (0, -priority)
+            elif stale < interval:
+                not_due += 1
+                continue
+            else:
+                key = (1, -(stale / interval) * priority)
+            heapq.heappush(self._heap, (*key, -priority, order, nickname))
+
+        logging.info(f"调度：{len(self._heap)} 个达人到期待采集，{not_due} 个未到刷新时间")
+        return len(self._heap)
+
+    def chunks(self, chunk_size=None):
+        """按得分从高到低分块输出达人，达到数量或时间预算后停止"""
+        chunk_size = chunk_size or Config.SCHEDULE_CHUNK_SIZE
+        deadline = time.monotonic() + self.max_minutes * 60 if self.max_minutes else None
+        remaining = self.max_creators if self.max_creators else len(self._heap)
+
+        while self._heap and remaining > 0:
+            if deadline is not None and time.monotonic() >= deadline:
+                logging.info(f"已达到本次运行的时间预算（{self.max_minutes}分钟），剩余 {len(self._heap)} 个达人留到下次")
+                return
+            size = min(chunk_size, remaining)
+            chunk = [heapq.heappop(self._heap)[-1] for _ in range(min(size, len(self._heap)))]
+            remaining -= len(chunk)
+            yield chunk
+
+        if self._heap:
+            logging.info(f"已达到本次运行的数量预算（{self.max_creators}个），剩余 {len(self._heap)} 个达人留到下次")
@@ -0,0 +1,100 @@
+# test_worker_pool.py
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import pandas as pd
+from config import Config
+from crawler_core import BaseCrawler
+from failures import RetryQueue, LoginGate
+from nickname_source import NicknameSource
+from result_store import ExcelResultStore
+from worker_pool import WorkerPool
+from async_runner import AsyncPipeline
+
+
+class StubExtractor:
+    """只带结果存储的提取器，不需要浏览器"""
+
+    name = 'stub'
+    label = '测试数据'
+
+    def __init__(self, excel_file):
+        self.excel_file = excel_file
+        self.result_store = ExcelResultStore(excel_file, flush_rows=0, flush_interval=0)
+        self.result_store.load()
+        self.checkpoint = mock.Mock()
+
+    def is_up_to_date(self, nickname):
+        return False
+
+    def is_fresh(self, nickname):
+        return False
+
+
+def stub_crawler(extractors, processed):
+    """不启动浏览器的采集器，search_nickname只记录处理过的昵称"""
+    crawler = object.__new__(BaseCrawler)
+    crawler.extractors = extractors
+    crawler.failures = {}
+    crawler.retry_queue = RetryQueue()
+    crawler.login_gate = LoginGate()
+    crawler._completed = {extractor.name: set() for extractor in extractors}
+
+    def search_nickname(nickname):
+        processed.append(nickname)
+        return True
+
+    def search_in_browser(nickname):
+        processed.append(nickname)
+        return {extractor.name: True for extractor in extractors}
+
+    crawler.search_nickname = search_nickname
+    crawler._search_in_browser = search_in_browser
+    return crawler
+
+
+class InputFileConcurrencyTest(unittest.TestCase):
+    """INPUT_FILE与多浏览器/异步模式一起使用时，结果收集器要支持追加昵称"""
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+        self.excel_file = os.path.join(self.workdir, 'result.xlsx')
+        self.input_file = os.path.join(self.workdir, 'input.xlsx')
+        pd.DataFrame({Config.NICKNAME_COLUMN: ['达人0']}).to_excel(
+            self.excel_file, sheet_name=Config.SHEET_NAME, index=False)
+        self.nicknames = [f"达人{i}" for i in range(25)]
+        pd.DataFrame({Config.NICKNAME_COLUMN: self.nicknames}).to_excel(self.input_file, index=False)
+
+        patcher = mock.patch.multiple(
+            Config, INPUT_FILE=self.input_file, BATCH_INPUTS=None, INPUT_CHUNK_SIZE=10,
+            BATCH_SIZE=10, BATCH_INTERVAL=0, WORKER_COUNT=2, FETCH_MODE='browser',
+            RATE_LIMIT=1000, RATE_LIMIT_MAX=1000, RATE_BURST=100)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(shutil.rmtree, self.workdir, True)
+
+    def _run(self, runner_class):
+        processed = []
+        extractor = StubExtractor(self.excel_file)
+        crawler = stub_crawler([extractor], processed)
+        worker = stub_crawler([extractor], processed)
+        pending = crawler._pending_chunks(NicknameSource(self.input_file).chunks())
+        with mock.patch('worker_pool.spawn_worker', return_value=worker), \
+                mock.patch('async_runner.spawn_worker', return_value=worker):
+            runner_class(crawler).run(pending)
+        extractor.result_store.close()
+        return processed
+
+    def test_worker_pool(self):
+        self.assertCountEqual(self._run(WorkerPool), self.nicknames)
+        saved = pd.read_excel(self.excel_file)[Config.NICKNAME_COLUMN]
+        self.assertCountEqual(saved, self.nicknames)
+
+    def test_async_pipeline(self):
+        self.assertCountEqual(self._run(AsyncPipeline), self.nicknames)
+
+
+if __name__ == '__main__':
+    unittest.main()
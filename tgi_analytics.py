@@ -0,0 +1,80 @@
+# tgi_analytics.py
+import logging
+import numpy as np
+import pandas as pd
+from config import Config
+from tgi_store import TgiStore
+from result_store import write_excel_atomic
+
+
+def _zscore(values, axis=0):
+    """按列（axis=0）或整体计算Z分数，标准差为0时结果为0"""
+    mean = np.nanmean(values, axis=axis, keepdims=True)
+    std = np.nanstd(values, axis=axis, keepdims=True)
+    z = np.where(std > 0, (values - mean) / np.where(std > 0, std, 1.0), 0.0)
+    return np.where(np.isnan(values), np.nan, z)
+
+
+def compute_tgi_metrics(nicknames, tiers, values, weights=None):
+    """
+    一次向量化计算所有达人的TGI指标
+    Args:
+        nicknames: 昵称列表（对应values的行）
+        tiers: 城市等级列表（对应values的列）
+        values: 达人数×城市等级数 的TGI数组，缺失为NaN
+        weights: {城市等级: 权重}，默认使用Config.TGI_TIER_WEIGHTS，未配置时等权
+    Returns:
+        每个达人一行的DataFrame：各等级TGI、均值、加权均值、均值Z分数、排名、各等级Z分数
+    """
+    weights = Config.TGI_TIER_WEIGHTS if weights is None else weights
+    with np.errstate(invalid='ignore', divide='ignore'):
+        present = ~np.isnan(values)
+        mean = np.nanmean(values, axis=1)
+
+        tier_weights = np.array([weights.get(tier, 0.0) if weights else 1.0 for tier in tiers])
+        weight_sum = present @ tier_weights
+        weighted_mean = np.where(weight_sum > 0, np.nansum(values * tier_weights, axis=1) / weight_sum, np.nan)
+
+        mean_z = _zscore(mean)
+        tier_z = _zscore(values, axis=0)
+
+    df = pd.DataFrame(values, columns=tiers)
+    df.insert(0, Config.NICKNAME_COLUMN, nicknames)
+    df[Config.TGI_COLUMN] = mean
+    df['TGI加权均值'] = weighted_mean
+    df['TGI均值Z分数'] = mean_z
+    df['TGI排名'] = pd.Series(mean).rank(ascending=False, method='min').astype('Int64')
+    for index, tier in enumerate(tiers):
+        df[f"{tier}Z分数"] = tier_z[:, index]
+    return df.sort_values('TGI排名', kind='stable').reset_index(drop=True)
+
+
+def export_tgi_analytics(store=None, excel_file=None, sheet_name=None):
+    """从TGI存储计算指标并写入分析结果Excel"""
+    excel_file = excel_file or Config.TGI_ANALYTICS_FILE
+    sheet_name = sheet_name or Config.SHEET_NAME
+    own_store = store is None
+    store = store or TgiStore()
+    try:
+        nicknames, tiers, values = store.matrix()
+    finally:
+        if own_store:
+            store.close()
+
+    if not nicknames:
+        logging.warning("TGI存储中还没有数据")
+        return None
+
+    df = compute_tgi_metrics(nicknames, tiers, values)
+    write_excel_atomic(df, excel_file, sheet_name)
+    logging.info(f"已计算 {len(df)} 个达人、{len(tiers)} 个城市等级的TGI指标并写入 {excel_file}")
+    return df
+
+
+if __name__ == "__main__":
+    # 重新计算TGI指标：python tgi_analytics.py
+    logging.basicConfig(
+        level=Config.LOG_CONFIG['level'],
+        format=Config.LOG_CONFIG['format']
+    )
+    export_tgi_analytics()
@@ -0,0 +1,102 @@
+# tgi_store.py
+import time
+import logging
+import sqlite3
+import threading
+import numpy as np
+import pandas as pd
+from config import Config
+
+
+class TgiStore:
+    """
+    保存每个达人完整的城市等级TGI向量（SQLite长表：昵称+城市等级），供批量分析使用；
+    另有从TgiData.xlsx导入的历史TGI均值（没有各等级的值），重新采集后以完整向量为准
+    """
+
+    def __init__(self, db_path=None):
+        """
+        Args:
+            db_path: SQLite文件路径，默认使用Config.TGI_DB
+        """
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path or Config.TGI_DB, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS tgi_city (
+                nickname TEXT NOT NULL,
+                tier TEXT NOT NULL,
+                value REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (nickname, tier)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS tgi_mean (
+                nickname TEXT PRIMARY KEY,
+                value REAL NOT NULL,
+                updated_at REAL NOT NULL
+            ) WITHOUT ROWID;
+        """)
+        self.conn.commit()
+
+    def upsert(self, nickname, city_label_tgi):
+        """
+        写入一个达人的城市等级TGI向量，替换该达人之前的数据
+        Args:
+            nickname: 达人昵称
+            city_label_tgi: [{'name': ..., 'value': ...}, ...]
+        """
+        now = time.time()
+        rows = [(nickname, str(item['name']), float(item['value']), now) for item in city_label_tgi]
+        with self._lock:
+            self.conn.execute("DELETE FROM tgi_city WHERE nickname = ?", (nickname,))
+            self.conn.executemany(
+                "INSERT INTO tgi_city (nickname, tier, value, updated_at) VALUES (?, ?, ?, ?)", rows)
+            self.conn.commit()
+        return len(rows)
+
+    def has_imported_means(self):
+        """是否已经导入过TgiData.xlsx中的TGI均值"""
+        with self._lock:
+            return self.conn.execute("SELECT 1 FROM tgi_mean LIMIT 1").fetchone() is not None
+
+    def import_means(self, df):
+        """从结果表导入已有的TGI均值，用于首次迁移TgiData.xlsx；已有完整向量的达人跳过"""
+        if Config.NICKNAME_COLUMN not in df.columns or Config.TGI_COLUMN not in df.columns:
+            return 0
+
+        values = pd.to_numeric(df[Config.TGI_COLUMN], errors='coerce')
+        means = df.assign(**{Config.TGI_COLUMN: values}).dropna(
+            subset=[Config.NICKNAME_COLUMN, Config.TGI_COLUMN])
+        now = time.time()
+        rows = [
+            (str(nickname), float(value), now)
+            for nickname, value in means[[Config.NICKNAME_COLUMN, Config.TGI_COLUMN]].itertuples(index=False)
+        ]
+        with self._lock:
+            collected = {row[0] for row in self.conn.execute("SELECT DISTINCT nickname FROM tgi_city")}
+            rows = [row for row in rows if row[0] not in collected]
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO tgi_mean (nickname, value, updated_at) VALUES (?, ?, ?)", rows)
+            self.conn.commit()
+        logging.info(f"已从结果表导入 {len(rows)} 个达人的TGI均值")
+        return len(rows)
+
+    def matrix(self):
+        """
+        读取所有达人的TGI向量
+        Returns:
+            (昵称列表, 城市等级列表, 形状为 达人数×城市等级数 的float数组，缺失值为NaN)
+        """
+        with self._lock:
+            long_df = pd.read_sql_query("SELECT nickname, tier, value FROM tgi_city", self.conn)
+        if long_df.empty:
+            return [], [], np.empty((0, 0))
+
+        wide = long_df.pivot(index='nickname', columns='tier', values='value')
+        return list(wide.index), list(wide.columns), wide.to_numpy(dtype=float)
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,203 @@
+# worker_pool.py
+import os
+import time
+import queue
+import itertools
+import shutil
+import logging
+import threading
+from contextlib import contextmanager
+from config import Config
+
+
+# 复制浏览器配置时跳过的缓存目录，只保留登录态相关文件
+PROFILE_IGNORE = shutil.ignore_patterns(
+    'Cache', 'Code Cache', 'GPUCache', 'Service Worker', 'CacheStorage',
+    'Crashpad', 'ShaderCache', 'GrShaderCache', 'DawnCache', '*.log', 'LOCK', 'Singleton*')
+
+
+def prepare_worker_profile(index):
+    """
+    从CHROME_USER_DATA_DIR复制一份独立的用户数据目录，返回目录路径
+    精简模式下登录态来自Cookie文件，只创建空白目录
+    """
+    target_dir = os.path.abspath(os.path.join(Config.WORKER_PROFILE_DIR, f"worker_{index}"))
+    source_profile = os.path.join(Config.CHROME_USER_DATA_DIR, Config.CHROME_PROFILE)
+    os.makedirs(target_dir, exist_ok=True)
+    if Config.LEAN_BROWSER:
+        return target_dir
+
+    try:
+        local_state = os.path.join(Config.CHROME_USER_DATA_DIR, 'Local State')
+        if os.path.exists(local_state):
+            shutil.copy2(local_state, target_dir)
+        shutil.copytree(source_profile, os.path.join(target_dir, Config.CHROME_PROFILE),
+                        ignore=PROFILE_IGNORE, dirs_exist_ok=True)
+    except (shutil.Error, OSError) as e:
+        # 浏览器运行中部分文件被占用时，复制其余文件后继续
+        logging.warning(f"复制浏览器配置到 {target_dir} 时部分文件失败: {str(e)[:200]}")
+    return target_dir
+
+
+def spawn_worker(primary, index):
+    """为第index个工作者创建使用独立浏览器的采集器，常驻浏览器模式下各用一个调试端口"""
+    debugger_port = Config.DEBUGGER_PORT + index if Config.BROWSER_MODE == 'attach' else None
+    return primary.spawn(prepare_worker_profile(index), debugger_port=debugger_port)
+
+
+class ResultCollector:
+    """单线程写入的结果收集器，多个工作线程提交的更新按顺序写入结果存储"""
+
+    def __init__(self, result_store):
+        self.result_store = result_store
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name='result-writer', daemon=True)
+        self._writer.start()
+
+    def has_nickname(self, nickname):
+        """检查结果表中是否存在该昵称"""
+        return self.result_store.has_nickname(nickname)
+
+    def is_transient(self, nickname):
+        """该昵称是否为批量模式追加的临时昵称"""
+        return self.result_store.is_transient(nickname)
+
+    def get_row(self, nickname):
+        """返回该昵称所在的第一行数据"""
+        return self.result_store.get_row(nickname)
+
+    def add_nicknames(self, nicknames, transient=False):
+        """追加结果表中还没有的昵称，transient为True时只保留在内存中"""
+        return self.result_store.add_nicknames(nicknames, transient=transient)
+
+    def update(self, nickname, values, dtype=None):
+        """提交一条更新，由写入线程异步写入结果存储"""
+        if not self.result_store.has_nickname(nickname):
+            return False
+        self._queue.put((nickname, values, dtype))
+        return True
+
+    def _write_loop(self):
+        """写入线程：依次取出更新写入结果存储"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            nickname, values, dtype = item
+            try:
+                self.result_store.update(nickname, values, dtype=dtype)
+            except Exception as e:
+                logging.error(f"写入 {nickname} 的结果时出错: {str(e)}")
+
+    def close(self):
+        """等待写入线程处理完队列中的所有更新"""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+
+
+@contextmanager
+def collecting_results(extractors):
+    """在上下文中把各提取器的结果存储替换为单线程写入的收集器"""
+    originals = [extractor.result_store for extractor in extractors]
+    collectors = [ResultCollector(store) for store in originals]
+    for extractor, collector in zip(extractors, collectors):
+        extractor.result_store = collector
+    try:
+        yield
+    finally:
+        for extractor, collector, original in zip(extractors, collectors, originals):
+            collector.close()
+            extractor.result_store = original
+
+
+class WorkerPool:
+    """多浏览器并发处理昵称，每个工作线程使用独立的浏览器配置目录"""
+
+    def __init__(self, primary, worker_count=None):
+        """
+        Args:
+            primary: 已初始化的采集器，作为第一个工作者使用
+            worker_count: 浏览器数量，默认使用Config.WORKER_COUNT
+        """
+        self.primary = primary
+        self.worker_count = worker_count or Config.WORKER_COUNT
+
+    def _worker_loop(self, index, nicknames_queue):
+        """工作线程：创建(或复用)采集器并持续处理队列中的昵称"""
+        processor = self.primary
+        try:
+            if index > 0:
+                # 新采集器共用主采集器的提取器，结果和断点记录写入同一处
+                processor = spawn_worker(self.primary, index)
+
+            processed = 0
+            while True:
+                nickname = nicknames_queue.get()
+                if nickname is None:
+                    break
+                if processor.login_gate.aborted:
+                    # 登录失效且未重新登录，只消费队列让读取线程结束
+                    continue
+
+                processor.search_nickname(nickname)
+                processed += 1
+                if processed % Config.BATCH_SIZE == 0:
+                    time.sleep(Config.BATCH_INTERVAL)
+
+            logging.info(f"工作者 {index} 处理完成，共 {processed} 个昵称")
+        except Exception as e:
+            logging.error(f"工作者 {index} 异常退出: {str(e)}")
+        finally:
+            if processor is not self.primary:
+                processor.close()
+
+    @staticmethod
+    def _feed(nicknames_queue, threads, item):
+        """向有界队列放入一项；队列已满且所有工作者都已退出时返回False，避免永久阻塞"""
+        while True:
+            try:
+                nicknames_queue.put(item, timeout=1)
+                return True
+            except queue.Full:
+                if not any(thread.is_alive() for thread in threads):
+                    return False
+
+    def run(self, chunks):
+        """
+        边读取边把昵称分发给所有工作者，等待全部处理完成
+        Args:
+            chunks: 昵称列表的可迭代对象，每个元素为一块昵称
+        """
+        chunks = iter(chunks)
+        first = next(chunks, [])
+        second = next(chunks, None)
+        worker_count = self.worker_count
+        if second is None:
+            # 只有一块时不创建多余的浏览器
+            worker_count = max(1, min(worker_count, len(first)))
+            chunks = iter([first])
+        else:
+            chunks = itertools.chain([first, second], chunks)
+        logging.info(f"启动 {worker_count} 个浏览器并发处理昵称")
+
+        # 有界队列：工作者处理不过来时暂停读取，避免整个列表堆积在内存中
+        nicknames_queue = queue.Queue(maxsize=worker_count * Config.BATCH_SIZE)
+        threads = [
+            threading.Thread(target=self._worker_loop, args=(i, nicknames_queue), name=f"worker-{i}")
+            for i in range(worker_count)
+        ]
+        with collecting_results(self.primary.extractors):
+            for thread in threads:
+                thread.start()
+            try:
+                for chunk in chunks:
+                    if not all(self._feed(nicknames_queue, threads, nickname) for nickname in chunk):
+                        logging.error("所有工作者都已退出，停止分发昵称")
+                        break
+            finally:
+                for _ in threads:
+                    if not self._feed(nicknames_queue, threads, None):
+                        break
+                for thread in threads:
+                    thread.join()